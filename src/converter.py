@@ -1,6 +1,8 @@
 """動画から音声への変換機能
 
 このモジュールは、FFmpegを使用して動画ファイルをMP3音声ファイルに変換するコア機能を提供します。
+変換時はFFmpegを直接サブプロセスとして起動し、ffmpeg-pythonはファイル情報の取得にのみ使用します。
+PyAVがインストールされている場合は、backend="pyav"でプロセスを起動せずに変換・情報取得することもできます。
 
 主要クラス:
     VideoToAudioConverter: 動画→音声変換を行うメインクラス
@@ -9,6 +11,7 @@
     - コーデック: libmp3lame（高品質MP3エンコーダー）
     - サンプリングレート: 44.1kHz（CD品質）
     - ビットレート: カスタマイズ可能（デフォルト192k）
+    - 音声がすでに指定ビットレート以下のMP3の場合は再エンコードせずにストリームをコピー（force_reencodeで無効化）
 
 エラーハンドリング:
     FFmpegのエラー出力を解析し、以下のような具体的な例外に変換:
@@ -20,13 +23,32 @@
 使用例:
     converter = VideoToAudioConverter(output_dir=Path("mp3"), bitrate="320k")
     output_path = converter.convert_file(Path("movie/video.mp4"))
+
+    # asyncioから利用する場合
+    output_path = await converter.convert_file_async(Path("movie/video.mp4"))
 """
 
+import asyncio
+import contextlib
+import errno
+import functools
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
 from pathlib import Path
 from typing import Any, Callable, Optional
 
 import ffmpeg
 
+# PyAVはオプション依存（poetry install -E pyav）
+try:
+    import av
+except ImportError:
+    av = None
+
 from src.exceptions import (
     ConversionError,
     FileInUseError,
@@ -34,33 +56,255 @@ from src.exceptions import (
     InsufficientSpaceError,
     PermissionError,
     UnsupportedFormatError,
+    VideoConverterError,
 )
 from src.utils import (
+    BatchContext,
     check_disk_space,
     create_output_directory,
+    find_ffmpeg,
     format_file_size,
+    get_cache_directory,
     get_output_path,
     is_supported_video_format,
     validate_ffmpeg,
 )
 
+# ffprobe結果のキャッシュを保存するディレクトリ（ユーザーのキャッシュディレクトリ内）
+PROBE_CACHE_DIR = get_cache_directory() / "probe"
+
+# FFmpeg起動時のサブプロセスオプション
+# 実行ファイルを絶対パスで指定し、close_fds=Falseとすると、CPythonはfork+execではなく
+# posix_spawnでプロセスを起動するため、Pythonプロセスのメモリが大きくても起動が速い。
+# Pythonが開くファイルディスクリプタは既定で継承不可のため、子プロセスには漏れない。
+_SPAWN_OPTIONS: dict[str, Any] = {"close_fds": False} if os.name == "posix" else {}
+
+# FFmpegの標準エラー出力を読み出す単位（バイト）
+STDERR_CHUNK_SIZE = 16 * 1024
+
+# FFmpegの標準エラー出力を受け取るパイプのPython側バッファサイズ（バイト）
+# 大きくしておくと、出力が多い場合でも1回のread呼び出しでまとめて取り込める
+STDERR_BUFFER_SIZE = 1 << 20
+
+# エラーメッセージに含めるFFmpegの標準エラー出力の長さ（末尾からのバイト数）
+ERROR_MESSAGE_BYTES = 512
+
+# FFmpegのエラー出力に含まれるメッセージと例外の種類の対応
+# 種類ごとの名前付きグループを1つの正規表現にまとめ、デコード前のエラー出力を1回走査するだけで
+# 判別できるようにする（一致したグループ名がlastgroupで得られる）
+_FFMPEG_ERROR_PATTERN = re.compile(
+    # ファイルアクセス権限エラー（Unix/Linuxでは"Permission denied"、Windowsでは"Access is denied"）
+    rb"(?P<permission>Permission denied|Access is denied)"
+    # ファイルが他のプロセスで使用中（主にWindows環境で発生）
+    rb"|(?P<in_use>Resource busy|being used by another process)"
+    # ディスク容量不足エラー
+    rb"|(?P<no_space>No space left)"
+)
+
+
+def _decode_error_tail(stderr: bytes) -> str:
+    """
+    FFmpegの標準エラー出力の末尾をメッセージ用にデコードする
+
+    原因を示すエラー行は出力の最後に書かれるため、末尾のERROR_MESSAGE_BYTESバイトだけを
+    デコードし、出力全体の文字列化を避ける。
+
+    Args:
+        stderr: FFmpegの標準エラー出力
+
+    Returns:
+        str: デコードしたエラー出力の末尾
+    """
+    return stderr[-ERROR_MESSAGE_BYTES:].decode("utf-8", errors="replace").strip()
+
+
+def _probe_pyav(path_str: str) -> dict[str, Any]:
+    """
+    PyAVでコンテナのヘッダーを読み、ffprobeと同じ形式の情報を返す
+
+    ffprobeのプロセスを起動せずにプロセス内で情報を取得できる。
+    呼び出し元で同じように扱えるよう、値はffprobeのJSON出力と同じく文字列で返す。
+
+    Args:
+        path_str: ファイルパス
+
+    Returns:
+        dict[str, Any]: ffprobeの出力と同じ形式の情報
+
+    Raises:
+        OSError: ファイルを開けない場合
+    """
+    with av.open(path_str) as container:
+        streams: list[dict[str, Any]] = []
+        for stream in container.streams:
+            info: dict[str, Any] = {
+                "codec_type": stream.type,
+                "codec_name": stream.codec_context.name,
+            }
+            if stream.bit_rate:
+                info["bit_rate"] = str(stream.bit_rate)
+            if stream.type == "audio" and stream.sample_rate:
+                info["sample_rate"] = str(stream.sample_rate)
+            streams.append(info)
+
+        format_info: dict[str, Any] = {
+            "format_name": container.format.name,
+            "size": str(container.size),
+        }
+        if container.duration is not None:
+            format_info["duration"] = str(container.duration / av.time_base)
+
+    return {"streams": streams, "format": format_info}
+
+
+@functools.lru_cache(maxsize=512)
+def _probe_cached(
+    path_str: str, mtime_ns: int, size: int, cache_path_str: str, backend: str = "ffmpeg"
+) -> dict[str, Any]:
+    """
+    ffprobeの結果をファイルの更新日時とサイズをキーにキャッシュして取得する
+
+    同じプロセス内では一覧表示・情報表示・変換で同じファイルを何度もprobeするため、
+    メモリ上のキャッシュで結果を共有する。メモリにない場合はディスク上のキャッシュを参照する。
+
+    Args:
+        path_str: ファイルパス
+        mtime_ns: ファイルの更新日時（ナノ秒）
+        size: ファイルサイズ（バイト）
+        cache_path_str: ディスク上のキャッシュファイルのパス
+        backend: "pyav"の場合はffprobeの代わりにPyAVで情報を取得する
+
+    Returns:
+        dict[str, Any]: ffprobeの出力（JSON）。呼び出し元で共有されるため変更しないこと
+
+    Raises:
+        ffmpeg.Error: ffprobeの実行に失敗した場合
+        OSError: PyAVでファイルを開けない場合
+    """
+    key = {"mtime_ns": mtime_ns, "size": size}
+    cache_path = Path(cache_path_str)
+
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cached.get("key") == key:
+            return dict(cached["probe"])
+    except (OSError, ValueError, KeyError, TypeError):
+        # キャッシュがない・壊れている場合はffprobeを実行する
+        pass
+
+    probe: dict[str, Any] = _probe_pyav(path_str) if backend == "pyav" else ffmpeg.probe(path_str)
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(
+            json.dumps({"key": key, "probe": probe}, ensure_ascii=False), encoding="utf-8"
+        )
+    except OSError:
+        # キャッシュの保存に失敗しても情報の取得には影響しない
+        pass
+
+    return probe
+
+
+def _stat_signature(path: Path) -> Optional[tuple[int, int]]:
+    """
+    ファイルが書き換えられたか判定するための更新日時とサイズを取得する
+
+    Args:
+        path: ファイルパス
+
+    Returns:
+        Optional[tuple[int, int]]: 更新日時（ナノ秒）とサイズ（ファイルがない場合はNone）
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _remove_written_outputs(before: dict[Path, Optional[tuple[int, int]]]) -> None:
+    """
+    失敗したFFmpegの実行で書き込まれた（途中までの）出力ファイルを削除する
+
+    実行前と更新日時またはサイズが変わっていない出力は、前回の変換結果として残す。
+
+    Args:
+        before: 実行前の出力ファイルパスごとの_stat_signature()の結果
+    """
+    for path, signature in before.items():
+        after = _stat_signature(path)
+        if after is not None and after != signature:
+            with contextlib.suppress(OSError):
+                path.unlink()
+
+
+def _wait_and_drain_stderr(process: "subprocess.Popen[bytes]") -> bytes:
+    """
+    プロセスの終了を待ちながら標準エラー出力を読み出す
+
+    終了後にまとめて読み出すと、出力量が多い場合にパイプのバッファ（Windowsでは数KB）が
+    埋まってFFmpegが書き込み待ちのまま停止するため、専用スレッドで逐次読み出す。
+
+    Args:
+        process: 標準エラー出力をパイプに接続したプロセス
+
+    Returns:
+        bytes: 標準エラー出力の内容
+    """
+    buffer = bytearray()
+    stderr = process.stderr
+
+    def drain() -> None:
+        if stderr is None:
+            return
+        for chunk in iter(lambda: stderr.read(STDERR_CHUNK_SIZE), b""):
+            buffer.extend(chunk)
+
+    thread = threading.Thread(target=drain, daemon=True)
+    thread.start()
+    process.wait()
+    thread.join()
+    return bytes(buffer)
+
 
 class VideoToAudioConverter:
     """動画を音声に変換するクラス"""
 
-    def __init__(self, output_dir: Path = Path("mp3"), bitrate: str = "192k") -> None:
+    def __init__(
+        self,
+        output_dir: Path = Path("mp3"),
+        bitrate: str = "192k",
+        skip_ffmpeg_check: bool = False,
+        force_reencode: bool = False,
+        verbose: bool = False,
+        backend: str = "ffmpeg",
+    ) -> None:
         """
         初期化
 
         Args:
             output_dir: 出力ディレクトリ
             bitrate: MP3のビットレート（例: "128k", "192k", "320k"）
+            skip_ffmpeg_check: Trueの場合はFFmpegの存在確認を省略する
+                （親プロセスで確認済みのワーカーなどで使用）
+            force_reencode: Trueの場合は音声がすでにMP3でも指定ビットレートで再エンコードする
+            verbose: Trueの場合はFFmpegのログレベルをinfoにする（デバッグ用）
+            backend: 変換方法（"ffmpeg"または"pyav"）。PyAVがインストールされていない場合は
+                "ffmpeg"にフォールバックする
         """
         self.output_dir = Path(output_dir)
         self.bitrate = bitrate
+        self.force_reencode = force_reencode
+        # 通常はエラーのみ出力させ、パイプで受け取る標準エラー出力の量を抑える
+        self.loglevel = "info" if verbose else "error"
+        self.backend = "pyav" if backend == "pyav" and av is not None else "ffmpeg"
+        # 出力先ディレクトリごとの残りの空き容量（_check_disk_space()で使用）
+        self._free_space: dict[Path, BatchContext] = {}
 
-        # FFmpegの存在確認
-        validate_ffmpeg()
+        # FFmpegの存在確認（PyAVはFFmpegのライブラリを同梱しているため不要）
+        if not skip_ffmpeg_check and self.backend == "ffmpeg":
+            validate_ffmpeg()
 
         # 出力ディレクトリを作成
         create_output_directory(self.output_dir)
@@ -86,6 +330,282 @@ class VideoToAudioConverter:
             FileInUseError: ファイルが使用中の場合
             InsufficientSpaceError: 空き容量が不足している場合
         """
+        output_path = self.prepare_output(input_path)
+
+        if self.backend == "pyav":
+            if progress_callback:
+                progress_callback(f"変換開始: {input_path.name}")
+            self._encode_pyav(input_path, output_path)
+            if progress_callback:
+                progress_callback(f"変換完了: {output_path.name}")
+            return output_path
+
+        try:
+            copy_audio = self._should_copy_audio(input_path)
+            command = self._build_command(input_path, output_path, copy_audio)
+
+            # 変換実行
+            if progress_callback:
+                progress_callback(f"変換開始: {input_path.name}")
+
+            # 標準エラー出力はパイプのバッファが埋まってFFmpegが停止しないよう、
+            # 別スレッドで少しずつ読み出す
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                bufsize=STDERR_BUFFER_SIZE,
+                **_SPAWN_OPTIONS,
+            )
+            stderr = _wait_and_drain_stderr(process)
+
+        except Exception as e:
+            raise ConversionError(f"予期しないエラーが発生しました: {e}", str(input_path)) from e
+
+        if process.returncode != 0:
+            # FFmpegのエラー出力をデコード（標準エラー出力に詳細が含まれる）
+            raise self._map_ffmpeg_error(input_path, stderr)
+
+        if progress_callback:
+            progress_callback(f"変換完了: {output_path.name}")
+
+        return output_path
+
+    async def convert_file_async(
+        self, input_path: Path, progress_callback: Optional[Callable[[str], None]] = None
+    ) -> Path:
+        """
+        単一ファイルを非同期に変換する
+
+        入力検証と容量チェックは別スレッドで、FFmpegはasyncioのサブプロセスとして実行するため、
+        イベントループをブロックせずに複数ファイルの変換を同時に進められる。
+
+        Args:
+            input_path: 入力ファイルパス
+            progress_callback: 進行状況コールバック関数
+
+        Returns:
+            Path: 出力ファイルパス
+
+        Raises:
+            convert_file()と同じ例外
+        """
+        loop = asyncio.get_running_loop()
+        output_path = await loop.run_in_executor(None, self.prepare_output, input_path)
+        return await self.encode_async(input_path, output_path, progress_callback)
+
+    async def encode_async(
+        self,
+        input_path: Path,
+        output_path: Path,
+        progress_callback: Optional[Callable[[str], None]] = None,
+    ) -> Path:
+        """
+        prepare_output()で検証済みのファイルをFFmpegで非同期に変換する
+
+        Args:
+            input_path: 入力ファイルパス
+            output_path: prepare_output()が返した出力ファイルパス
+            progress_callback: 進行状況コールバック関数
+
+        Returns:
+            Path: 出力ファイルパス
+
+        Raises:
+            ConversionError: 変換中にエラーが発生した場合
+            PermissionError: ファイルアクセス権限がない場合
+            FileInUseError: ファイルが使用中の場合
+            InsufficientSpaceError: 空き容量が不足している場合
+        """
+        loop = asyncio.get_running_loop()
+
+        if self.backend == "pyav":
+            if progress_callback:
+                progress_callback(f"変換開始: {input_path.name}")
+            # PyAVはGILを解放してデコード・エンコードするため、別スレッドで並列に実行できる
+            await loop.run_in_executor(None, self._encode_pyav, input_path, output_path)
+            if progress_callback:
+                progress_callback(f"変換完了: {output_path.name}")
+            return output_path
+
+        try:
+            # ffprobeの実行はブロッキングのため別スレッドで行う
+            copy_audio = await loop.run_in_executor(None, self._should_copy_audio, input_path)
+            command = self._build_command(input_path, output_path, copy_audio)
+
+            if progress_callback:
+                progress_callback(f"変換開始: {input_path.name}")
+
+            returncode, stderr = await self._run_ffmpeg_async(command)
+
+        except Exception as e:
+            raise ConversionError(f"予期しないエラーが発生しました: {e}", str(input_path)) from e
+
+        if returncode != 0:
+            raise self._map_ffmpeg_error(input_path, stderr or b"")
+
+        if progress_callback:
+            progress_callback(f"変換完了: {output_path.name}")
+
+        return output_path
+
+    async def encode_group_async(
+        self,
+        items: list[tuple[Path, Path]],
+        progress_callback: Optional[Callable[[str], None]] = None,
+    ) -> list[Path]:
+        """
+        prepare_output()で検証済みの複数ファイルを1回のFFmpeg起動でまとめて変換する
+
+        短いファイルではFFmpegの起動コストが変換時間の大半を占めるため、
+        入力ごとに-iと-mapを並べた1つのコマンドで変換して起動コストを分散させる。
+        ストリームコピーの判定は個別変換と同じく_should_copy_audio()で行うため、
+        MP3の音声は一括変換でもコピーされる。ffprobeの結果はキャッシュされるため、
+        同じファイルを再度変換する場合はffprobeを起動しない。
+        FFmpegはすべての出力を並行して書き出し、MP3の末尾は最後に書き込むため、
+        失敗した場合はどの出力も完成していない。このため失敗時はこの実行で書き込まれた
+        出力を削除する（書き込まれる前に失敗した場合、前回の変換結果はそのまま残す）。
+        呼び出し側ではグループ内のすべてのファイルをencode_async()で個別に変換し直すこと。
+
+        Args:
+            items: 入力ファイルパスと出力ファイルパスの組のリスト
+            progress_callback: 進行状況コールバック関数
+
+        Returns:
+            list[Path]: 出力ファイルパスのリスト
+
+        Raises:
+            ConversionError: 変換中にエラーが発生した場合
+        """
+        # PyAVはプロセスを起動しないため、まとめて変換しても得られるものがない
+        if len(items) == 1 or self.backend == "pyav":
+            return [
+                await self.encode_async(input_path, output_path, progress_callback)
+                for input_path, output_path in items
+            ]
+
+        output_paths = [output_path for _, output_path in items]
+        before = {output_path: _stat_signature(output_path) for output_path in output_paths}
+
+        try:
+            loop = asyncio.get_running_loop()
+            copy_flags = await asyncio.gather(
+                *(
+                    loop.run_in_executor(None, self._should_copy_audio, input_path)
+                    for input_path, _ in items
+                )
+            )
+            command = self._build_group_command(
+                [
+                    (input_path, output_path, copy_audio)
+                    for (input_path, output_path), copy_audio in zip(items, copy_flags)
+                ]
+            )
+
+            if progress_callback:
+                progress_callback(f"一括変換開始: {len(items)}ファイル")
+
+            returncode, stderr = await self._run_ffmpeg_async(command)
+
+        except Exception as e:
+            _remove_written_outputs(before)
+            raise ConversionError(f"予期しないエラーが発生しました: {e}") from e
+
+        if returncode != 0:
+            _remove_written_outputs(before)
+            raise ConversionError(
+                f"一括変換中にエラーが発生しました: {_decode_error_tail(stderr or b'')}"
+            )
+
+        if progress_callback:
+            progress_callback(f"一括変換完了: {len(items)}ファイル")
+
+        return output_paths
+
+    def _encode_pyav(self, input_path: Path, output_path: Path) -> None:
+        """
+        PyAVを使用してプロセス内で最初の音声ストリームをMP3に変換する
+
+        Args:
+            input_path: 入力ファイルパス
+            output_path: 出力ファイルパス
+
+        Raises:
+            ConversionError: 変換中にエラーが発生した場合
+            PermissionError: ファイルアクセス権限がない場合
+            FileInUseError: ファイルが使用中の場合
+            InsufficientSpaceError: 空き容量が不足している場合
+        """
+        try:
+            with (
+                av.open(str(input_path)) as in_container,
+                av.open(str(output_path), mode="w") as out_container,
+            ):
+                in_stream = in_container.streams.audio[0]
+                out_stream = out_container.add_stream("mp3", rate=44100)
+                out_stream.bit_rate = int(self.bitrate.rstrip("k")) * 1000
+
+                for frame in in_container.decode(in_stream):
+                    # サンプリングレート変換後のタイムスタンプはエンコーダーに振り直させる
+                    frame.pts = None
+                    out_container.mux(out_stream.encode(frame))
+                # エンコーダー内に残っているフレームを書き出す
+                out_container.mux(out_stream.encode(None))
+
+        except IndexError as e:
+            raise ConversionError("音声ストリームが見つかりません", str(input_path)) from e
+        except OSError as e:
+            # PyAVの例外はerrnoを持つOSErrorのサブクラスとして送出される
+            if e.errno in (errno.EACCES, errno.EPERM):
+                raise PermissionError("ファイルアクセス権限がありません", str(input_path)) from e
+            elif e.errno == errno.EBUSY:
+                raise FileInUseError("ファイルが他のプロセスで使用中です", str(input_path)) from e
+            elif e.errno == errno.ENOSPC:
+                raise InsufficientSpaceError("容量が不足しています") from e
+            raise ConversionError(f"変換中にエラーが発生しました: {e}", str(input_path)) from e
+        except Exception as e:
+            raise ConversionError(f"予期しないエラーが発生しました: {e}", str(input_path)) from e
+
+    async def _run_ffmpeg_async(self, command: list[str]) -> tuple[Optional[int], bytes]:
+        """
+        FFmpegを非同期に実行し、終了コードと標準エラー出力を返す
+
+        Args:
+            command: FFmpegのコマンドライン引数
+
+        Returns:
+            tuple[Optional[int], bytes]: 終了コードと標準エラー出力
+        """
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+            **_SPAWN_OPTIONS,
+        )
+        _, stderr = await process.communicate()
+        return process.returncode, stderr
+
+    def prepare_output(self, input_path: Path, ctx: Optional[BatchContext] = None) -> Path:
+        """
+        入力ファイルを検証し、出力ファイルパスを決定する
+
+        存在確認・形式確認・容量チェックといったI/O中心の前処理のみを行い、変換は行わない。
+
+        Args:
+            input_path: 入力ファイルパス
+            ctx: 一括変換用のコンテキスト（指定時は空き容量をメモリ上で集計する）
+
+        Returns:
+            Path: 出力ファイルパス
+
+        Raises:
+            FileNotFoundError: 入力ファイルが見つからない場合
+            UnsupportedFormatError: 対応していない形式の場合
+            PermissionError: ファイルにアクセスできない場合
+            InsufficientSpaceError: 空き容量が不足している場合
+        """
         # 入力ファイルの存在確認
         if not input_path.exists():
             raise FileNotFoundError("入力ファイルが見つかりません", str(input_path))
@@ -108,64 +628,239 @@ class VideoToAudioConverter:
             # 経験則として動画ファイルの10%程度 + 安全マージン50%で推定
             # 最小でも10MBは確保（短い動画でも安全に変換できるようにする）
             estimated_output_size = max(int(input_size_mb * 0.15), 10)
-            check_disk_space(output_path, estimated_output_size)
+            if ctx is not None:
+                check_disk_space(output_path, estimated_output_size, ctx)
+            else:
+                self._check_disk_space(output_path, estimated_output_size)
         except OSError as e:
             raise PermissionError(f"ファイルにアクセスできません: {e}", str(input_path)) from e
 
+        return output_path
+
+    def _check_disk_space(self, output_path: Path, required_space_mb: int) -> None:
+        """
+        出力先ディレクトリの空き容量を記録しながらチェックする
+
+        同じディレクトリへの2回目以降の変換では、記録した空き容量から推定出力サイズを
+        差し引いて判定し、disk_usageを呼び出さない。記録した値で不足する場合のみ、
+        実際の空き容量を取得し直す。
+
+        Args:
+            output_path: 出力ファイルパス
+            required_space_mb: 必要な空き容量（MB）
+
+        Raises:
+            InsufficientSpaceError: 空き容量が不足している場合
+        """
+        directory = output_path.parent
+        cached = self._free_space.get(directory)
+        if cached is not None and cached.free_bytes >= required_space_mb * 1024 * 1024:
+            check_disk_space(output_path, required_space_mb, cached)
+            return
+
+        remaining = check_disk_space(output_path, required_space_mb)
+        self._free_space[directory] = BatchContext(free_bytes=int(remaining))
+
+    def _should_copy_audio(self, input_path: Path) -> bool:
+        """
+        音声ストリームを再エンコードせずにコピーできるか判定する
+
+        入力の最初の音声ストリームがすでに指定ビットレート以下のMP3の場合は、
+        デコードとエンコードを省略してストリームをそのままコピーできる。
+        指定より高いビットレートやビットレート不明の場合は、指定どおりの出力にするため再エンコードする。
+
+        Args:
+            input_path: 入力ファイルパス
+
+        Returns:
+            bool: コピーできる場合True
+        """
+        if self.force_reencode:
+            return False
+
         try:
-            # ffmpeg-pythonを使用してMP3に変換
-            input_stream = ffmpeg.input(str(input_path))
-            output_stream = ffmpeg.output(
-                input_stream,
-                str(output_path),
-                acodec="libmp3lame",
-                ab=self.bitrate,
-                ar="44100",  # サンプリングレート 44.1kHz
-            )
+            probe = self._probe(input_path)
+        except Exception:
+            # 判定できない場合は通常どおり再エンコードする
+            return False
+
+        audio_stream = next(
+            (stream for stream in probe.get("streams", []) if stream.get("codec_type") == "audio"),
+            None,
+        )
+        if audio_stream is None or audio_stream.get("codec_name") != "mp3":
+            return False
 
-            # 既存ファイルを上書き
-            output_stream = ffmpeg.overwrite_output(output_stream)
+        try:
+            source_bitrate = int(audio_stream["bit_rate"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        return source_bitrate <= int(self.bitrate.rstrip("k")) * 1000
+
+    def _build_command(
+        self, input_path: Path, output_path: Path, copy_audio: bool = False
+    ) -> list[str]:
+        """
+        MP3変換用のFFmpegコマンドライン引数を構築する
 
-            # 変換実行
-            if progress_callback:
-                progress_callback(f"変換開始: {input_path.name}")
+        ffmpeg-pythonのストリームグラフを経由せず、引数リストを直接組み立てる。
 
-            ffmpeg.run(output_stream, quiet=True, capture_stdout=True, capture_stderr=True)
+        Args:
+            input_path: 入力ファイルパス
+            output_path: 出力ファイルパス
+            copy_audio: Trueの場合は再エンコードせずに最初の音声ストリームをコピーする
 
-            if progress_callback:
-                progress_callback(f"変換完了: {output_path.name}")
+        Returns:
+            list[str]: FFmpegのコマンドライン引数
+        """
+        command = [
+            *self._base_args(),
+            *self._input_args(input_path),
+            "-vn",  # 映像ストリームを無視
+        ]
 
-        except ffmpeg.Error as e:
-            # FFmpegのエラー出力をデコード（標準エラー出力に詳細が含まれる）
-            error_message = e.stderr.decode("utf-8") if e.stderr else str(e)
+        if copy_audio:
+            # _should_copy_audio()で判定したストリームをそのままコピーする
+            command += ["-map", "0:a:0"]
+        command += self._codec_args(copy_audio)
 
-            # エラーメッセージの内容を解析して、具体的な例外クラスにマッピング
-            # これにより、呼び出し側で適切なエラーハンドリングが可能になる
+        command.append(str(output_path))
+        return command
 
-            # ファイルアクセス権限エラー（Unix/Linuxでは"Permission denied"、Windowsでは"Access is denied"）
-            if "Permission denied" in error_message or "Access is denied" in error_message:
-                raise PermissionError("ファイルアクセス権限がありません", str(input_path)) from e
+    def _build_group_command(self, items: list[tuple[Path, Path, bool]]) -> list[str]:
+        """
+        複数ファイルを1回で変換するFFmpegコマンドライン引数を構築する
 
-            # ファイルが他のプロセスで使用中（主にWindows環境で発生）
-            elif (
-                "Resource busy" in error_message or "being used by another process" in error_message
-            ):
-                raise FileInUseError("ファイルが他のプロセスで使用中です", str(input_path)) from e
+        入力ごとに-iを並べ、出力ごとに対応する入力の最初の音声ストリームを-mapで割り当てる。
 
-            # ディスク容量不足エラー
-            elif "No space left" in error_message:
-                raise InsufficientSpaceError("容量が不足しています") from e
+        Args:
+            items: 入力ファイルパス、出力ファイルパス、音声コピーの有無の組のリスト
 
-            # 上記以外の変換エラー（コーデックエラー、破損ファイルなど）
-            else:
-                raise ConversionError(
-                    f"変換中にエラーが発生しました: {error_message}", str(input_path)
-                ) from e
+        Returns:
+            list[str]: FFmpegのコマンドライン引数
+        """
+        command = self._base_args()
+        for input_path, _, _ in items:
+            command += self._input_args(input_path)
 
-        except Exception as e:
-            raise ConversionError(f"予期しないエラーが発生しました: {e}", str(input_path)) from e
+        for index, (_, output_path, copy_audio) in enumerate(items):
+            command += ["-map", f"{index}:a:0", *self._codec_args(copy_audio), str(output_path)]
 
-        return output_path
+        return command
+
+    def _base_args(self) -> list[str]:
+        """
+        すべてのFFmpegコマンドに共通する先頭の引数を返す
+
+        Returns:
+            list[str]: 実行ファイルと全体オプション
+        """
+        return [
+            # 絶対パスで指定するとPOSIX環境ではposix_spawnで起動できる（_SPAWN_OPTIONS参照）
+            find_ffmpeg() or "ffmpeg",
+            "-nostdin",  # 標準入力を読まない（対話的モードの入力を奪わないようにする）
+            "-hide_banner",  # バージョン・ビルド構成の表示を省略
+            "-loglevel",
+            self.loglevel,
+            "-y",  # 既存ファイルを上書き
+        ]
+
+    def _input_args(self, input_path: Path) -> list[str]:
+        """
+        入力ファイル1つ分の引数を返す
+
+        Args:
+            input_path: 入力ファイルパス
+
+        Returns:
+            list[str]: 入力オプションと-i指定
+        """
+        return [
+            # 入力動画のデコードをマルチスレッド化する（libmp3lame自体はシングルスレッドのため、
+            # H.264などの重いコーデックではデコードがボトルネックになる）
+            "-threads",
+            "0",
+            "-i",
+            str(input_path),
+        ]
+
+    def _codec_args(self, copy_audio: bool) -> list[str]:
+        """
+        出力1つ分の音声コーデック引数を返す
+
+        Args:
+            copy_audio: Trueの場合は再エンコードせずに音声ストリームをコピーする
+
+        Returns:
+            list[str]: 音声コーデックオプション
+        """
+        if copy_audio:
+            return ["-acodec", "copy"]
+        return [
+            "-acodec",
+            "libmp3lame",
+            "-ab",
+            self.bitrate,
+            "-ar",
+            "44100",  # サンプリングレート 44.1kHz
+        ]
+
+    def _map_ffmpeg_error(self, input_path: Path, stderr: bytes) -> VideoConverterError:
+        """
+        FFmpegのエラー出力を解析して、具体的な例外に変換する
+
+        これにより、呼び出し側で適切なエラーハンドリングが可能になる
+
+        Args:
+            input_path: 入力ファイルパス
+            stderr: FFmpegの標準エラー出力
+
+        Returns:
+            VideoConverterError: エラー内容に対応する例外インスタンス
+        """
+        match = _FFMPEG_ERROR_PATTERN.search(stderr)
+        kind = match.lastgroup if match else None
+
+        if kind == "permission":
+            return PermissionError("ファイルアクセス権限がありません", str(input_path))
+
+        elif kind == "in_use":
+            return FileInUseError("ファイルが他のプロセスで使用中です", str(input_path))
+
+        elif kind == "no_space":
+            return InsufficientSpaceError("容量が不足しています")
+
+        # 上記以外の変換エラー（コーデックエラー、破損ファイルなど）
+        else:
+            # デコードはメッセージに含める末尾のみ行う
+            return ConversionError(
+                f"変換中にエラーが発生しました: {_decode_error_tail(stderr)}", str(input_path)
+            )
+
+    def _probe(self, file_path: Path) -> dict[str, Any]:
+        """
+        ffprobeの結果を取得する
+
+        結果はメモリとユーザーのキャッシュディレクトリ内のJSONにキャッシュし、ファイルの更新日時とサイズが
+        変わっていなければ次回以降はffprobeを起動せずに再利用する。
+        PyAVバックエンドの場合はffprobeを起動せず、プロセス内でコンテナのヘッダーを読む。
+
+        Args:
+            file_path: ファイルパス
+
+        Returns:
+            dict[str, Any]: ffprobeの出力（JSON）
+
+        Raises:
+            ffmpeg.Error: ffprobeの実行に失敗した場合
+        """
+        stat = file_path.stat()
+        # 別のディレクトリにある同名のファイルと区別するため、絶対パスのハッシュで保存する
+        digest = hashlib.sha256(os.fsencode(file_path.resolve())).hexdigest()
+        cache_path = PROBE_CACHE_DIR / f"{digest}.json"
+        return _probe_cached(
+            str(file_path), stat.st_mtime_ns, stat.st_size, str(cache_path), self.backend
+        )
 
     def get_file_info(self, file_path: Path) -> dict[str, Any]:
         """
@@ -178,7 +873,7 @@ class VideoToAudioConverter:
             Dict[str, Any]: ファイル情報
         """
         try:
-            probe = ffmpeg.probe(str(file_path))
+            probe = self._probe(file_path)
 
             # 動画情報を取得
             video_info: dict[str, Any] = next(
@@ -221,11 +916,6 @@ class VideoToAudioConverter:
         Returns:
             str: フォーマットされた時間文字列
         """
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-
-        if hours > 0:
-            return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-        else:
-            return f"{minutes:02d}:{secs:02d}"
+        hours, rest = divmod(int(seconds), 3600)
+        minutes, secs = divmod(rest, 60)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
@@ -23,12 +23,26 @@
             print(f"対象ファイル: {e.file_path}")
 """
 
-from typing import Optional
+from typing import Any, Optional
+
+__all__ = [
+    "VideoConverterError",
+    "FileNotFoundError",
+    "UnsupportedFormatError",
+    "FFmpegNotFoundError",
+    "ConversionError",
+    "InsufficientSpaceError",
+    "PermissionError",
+    "FileInUseError",
+]
 
 
 class VideoConverterError(Exception):
     """ビデオ変換に関する基底例外クラス"""
 
+    # 属性をインスタンス辞書ではなくスロットに保持する（サブクラスも空の__slots__を定義する）
+    __slots__ = ("message", "file_path", "_str")
+
     def __init__(self, message: str, file_path: Optional[str] = None) -> None:
         """
         初期化
@@ -37,53 +51,57 @@ class VideoConverterError(Exception):
             message: エラーメッセージ
             file_path: エラーが発生したファイルパス
         """
-        super().__init__(message)
         self.message = message
         self.file_path = file_path
+        # 表示用の文字列は生成時に一度だけ組み立て、str()のたびに再フォーマットしない
+        self._str = f"{message} (ファイル: {file_path})" if file_path else message
+        super().__init__(self._str)
 
     def __str__(self) -> str:
-        if self.file_path:
-            return f"{self.message} (ファイル: {self.file_path})"
-        return self.message
+        return self._str
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # スロットの属性は既定のpickle処理では復元されないため、元の引数で再生成する
+        return (type(self), (self.message, self.file_path))
 
 
 class FileNotFoundError(VideoConverterError):
     """入力ファイルが見つからない場合の例外"""
 
-    pass
+    __slots__ = ()
 
 
 class UnsupportedFormatError(VideoConverterError):
     """対応していない形式の場合の例外"""
 
-    pass
+    __slots__ = ()
 
 
 class FFmpegNotFoundError(VideoConverterError):
     """FFmpegがシステムに見つからない場合の例外"""
 
-    pass
+    __slots__ = ()
 
 
 class ConversionError(VideoConverterError):
     """変換処理中にエラーが発生した場合の例外"""
 
-    pass
+    __slots__ = ()
 
 
 class InsufficientSpaceError(VideoConverterError):
     """十分な空き容量がない場合の例外"""
 
-    pass
+    __slots__ = ()
 
 
 class PermissionError(VideoConverterError):
     """ファイルアクセス権限がない場合の例外"""
 
-    pass
+    __slots__ = ()
 
 
 class FileInUseError(VideoConverterError):
     """ファイルが他のプロセスで使用中の場合の例外"""
 
-    pass
+    __slots__ = ()
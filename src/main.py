@@ -6,7 +6,7 @@
 主な機能:
     - 対話的モード: movieディレクトリ内のファイルをテーブル形式で表示し、選択して変換
     - コマンドラインモード: 特定のファイルを直接変換
-    - バッチ変換: 複数ファイルを一括変換
+    - バッチ変換: 複数ファイルをasyncioで並列に一括変換
     - ファイル情報表示: FFmpegを使用した詳細なメディア情報の取得
     - Windows環境対応: UTF-8エンコーディングの自動設定
 
@@ -21,25 +21,47 @@
         $ poetry run mp4tomp3 -f movie/video.mp4 -b 320k
 """
 
+import asyncio
+import contextlib
+import functools
+import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Annotated, Optional
+from typing import Annotated, Any, Optional
 
 import typer
 from rich.console import Console
+from rich.progress import Progress, TaskID
 from rich.table import Table
 
 from src.converter import VideoToAudioConverter
 from src.exceptions import VideoConverterError
-from src.utils import SUPPORTED_VIDEO_FORMATS, get_video_files, is_supported_video_format
+from src.utils import (
+    SUPPORTED_VIDEO_FORMATS,
+    VALID_BITRATES,
+    BatchContext,
+    is_supported_video_format,
+    scan_video_files,
+)
+
+
+@functools.cache
+def _init_windows_console() -> None:
+    """
+    Windows環境でコンソールのエンコーディングをUTF-8に設定する
+
+    PowerShellやコマンドプロンプトでは、デフォルトのコードページがShift-JISなどになっている場合があり、
+    日本語ファイル名が文字化けする問題を防ぐため、UTF-8に強制設定します。
+    モジュールのインポート時ではなくコマンド実行時に呼び出し、結果をキャッシュして
+    2回目以降の呼び出しではWin32 APIや環境変数の書き換えを行わない。
+    """
+    if sys.platform != "win32":
+        return
 
-# Windows環境でのUTF-8エンコーディング設定
-# PowerShellやコマンドプロンプトでは、デフォルトのコードページがShift-JISなどになっている場合があり、
-# 日本語ファイル名が文字化けする問題を防ぐため、UTF-8に強制設定します。
-if sys.platform == "win32":
     try:
         import ctypes
-        import os
 
         # Windows APIでコンソールコードページをUTF-8に設定
         # 65001はUTF-8のコードページ番号
@@ -57,13 +79,15 @@ if sys.platform == "win32":
         if hasattr(sys.stdin, "reconfigure"):
             sys.stdin.reconfigure(encoding="utf-8", errors="replace")
 
-        # 環境変数も設定（FFmpegなど子プロセスでも同じエンコーディングを使用）
+        # 環境変数も設定（FFmpegなど子プロセスは親の環境変数を引き継ぐため、
+        # 子プロセス側でWin32 APIを呼び直す必要がない）
         os.environ["PYTHONIOENCODING"] = "utf-8"
         os.environ["PYTHONUTF8"] = "1"  # Python 3.7以降でUTF-8モードを有効化
     except Exception:
-        # エラーが発生しても処理を続行（環境によってはcryptoが使えない場合がある）
+        # エラーが発生しても処理を続行（環境によってはctypesが使えない場合がある）
         pass
 
+
 app = typer.Typer(
     name="mp4tomp3",
     help="動画ファイルをMP3に変換します。",
@@ -76,6 +100,11 @@ console = Console(
     legacy_windows=False,
 )
 
+# このサイズ以下のファイルは1回のFFmpeg起動でまとめて変換する（起動コストが支配的なため）
+GROUP_FILE_SIZE_LIMIT = 16 * 1024 * 1024
+# 1回のFFmpeg起動でまとめて変換するファイル数の上限
+MAX_GROUP_SIZE = 8
+
 
 def print_progress(message: str) -> None:
     """進行状況を表示する"""
@@ -94,27 +123,71 @@ def print_success(message: str) -> None:
 
 def list_video_files_table(movie_dir: Path) -> list[Path]:
     """movieディレクトリ内の動画ファイルを表形式で表示する"""
-    video_files = get_video_files(movie_dir)
+    scanned = scan_video_files(movie_dir)
 
-    if not video_files:
+    if not scanned:
         # 動画ファイルがない場合は何も表示せず空リストを返す
         # （呼び出し側で適切なメッセージを表示する）
         return []
 
-    table = Table(title=f"\nmovieディレクトリ内の動画ファイル ({len(video_files)}個)")
+    table = Table(title=f"\nmovieディレクトリ内の動画ファイル ({len(scanned)}個)")
     table.add_column("番号", justify="right", style="cyan", no_wrap=True)
     table.add_column("ファイル名", style="magenta")
     table.add_column("サイズ", justify="right", style="green")
 
-    for i, file_path in enumerate(video_files, 1):
-        try:
-            file_size = file_path.stat().st_size / (1024 * 1024)  # MB
-            table.add_row(str(i), file_path.name, f"{file_size:.1f} MB")
-        except OSError:
+    # サイズは走査時に取得済みのものを使い、ファイルごとのstat呼び出しを省く
+    for i, (file_path, size) in enumerate(scanned, 1):
+        if size is None:
             table.add_row(str(i), file_path.name, "サイズ不明")
+        else:
+            table.add_row(str(i), file_path.name, f"{size / (1024 * 1024):.1f} MB")
 
     console.print(table)
-    return video_files
+    return [file_path for file_path, _ in scanned]
+
+
+def print_file_info(info: dict[str, Any], converter: VideoToAudioConverter) -> None:
+    """
+    get_file_info()で取得したファイル情報を表形式で表示する
+
+    Args:
+        info: ファイル情報
+        converter: 時間のフォーマットに使用するコンバーターインスタンス
+    """
+    if "error" in info:
+        print_error(info["error"])
+        return
+
+    table = Table(title="ファイル情報")
+    table.add_column("項目", style="cyan")
+    table.add_column("値", style="green")
+
+    table.add_row("ファイル名", info["filename"])
+    table.add_row("サイズ", info["size"])
+    table.add_row("時間", converter.format_duration(info["duration"]))
+    table.add_row("形式", info["format_name"])
+    table.add_row("動画コーデック", info["video_codec"])
+    table.add_row("音声コーデック", info["audio_codec"])
+
+    console.print(table)
+
+
+def print_file_infos(video_files: list[Path], converter: VideoToAudioConverter, jobs: int) -> None:
+    """
+    複数ファイルの情報をまとめて取得して表示する
+
+    ffprobeの実行はI/O待ちが中心のため、スレッドプールで同時に実行する。
+
+    Args:
+        video_files: ファイルパスのリスト
+        converter: コンバーターインスタンス
+        jobs: 同時に実行するffprobeの数
+    """
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        infos = list(pool.map(converter.get_file_info, video_files))
+
+    for info in infos:
+        print_file_info(info, converter)
 
 
 def convert_single_file(
@@ -134,22 +207,7 @@ def convert_single_file(
     try:
         # ファイル情報を表示
         if show_info:
-            info = converter.get_file_info(file_path)
-            if "error" in info:
-                print_error(info["error"])
-            else:
-                table = Table(title="ファイル情報")
-                table.add_column("項目", style="cyan")
-                table.add_column("値", style="green")
-
-                table.add_row("ファイル名", info["filename"])
-                table.add_row("サイズ", info["size"])
-                table.add_row("時間", converter.format_duration(info["duration"]))
-                table.add_row("形式", info["format_name"])
-                table.add_row("動画コーデック", info["video_codec"])
-                table.add_row("音声コーデック", info["audio_codec"])
-
-                console.print(table)
+            print_file_info(converter.get_file_info(file_path), converter)
 
         # 変換実行
         output_path = converter.convert_file(file_path, print_progress)
@@ -164,8 +222,213 @@ def convert_single_file(
         return False
 
 
-def convert_interactive(converter: VideoToAudioConverter) -> None:
-    """対話的モードで変換を実行する"""
+async def _convert_all_async(
+    video_files: list[Path], converter: VideoToAudioConverter, jobs: int
+) -> int:
+    """
+    複数ファイルを前処理・変換・結果表示のパイプラインで同時に変換する
+
+    前処理（存在確認・容量チェック）、変換（FFmpeg）、結果表示をそれぞれ別タスクとし、
+    上限付きキューで接続する。これにより次のファイルのI/O中心の前処理が、
+    現在のファイルのCPU中心の変換と重なって実行される。
+    GROUP_FILE_SIZE_LIMIT以下の小さいファイルはまとめて1回のFFmpeg起動で変換し、
+    失敗した場合はグループ内のすべてのファイルをファイルごとに変換し直す。
+    a.mp4とa.mkvのように出力先が重複するファイルは、先に前処理したもの以外をエラーとする。
+    FFmpegは変換ごとに独立したプロセスとして動作するため、プロセスプールは使わず、
+    同時に起動するFFmpegプロセス数をjobs個の変換タスクで制限する。
+
+    Args:
+        video_files: 変換するファイルパスのリスト
+        converter: コンバーターインスタンス
+        jobs: 同時に起動するFFmpegプロセス数
+
+    Returns:
+        int: 変換に成功したファイル数
+    """
+    loop = asyncio.get_running_loop()
+
+    # サイズの大きいファイルから先に変換を開始し、小さいファイルで隙間を埋める
+    # （最も長いジョブが最後に残って全体の完了が遅れるのを防ぐ）
+    sizes = {path: _file_size(path) for path in video_files}
+    video_files = sorted(video_files, key=sizes.__getitem__, reverse=True)
+
+    # 小さいファイルのグループ数が変換タスク数を下回らないようにグループの大きさを決める
+    small_count = sum(1 for size in sizes.values() if size <= GROUP_FILE_SIZE_LIMIT)
+    group_size = min(MAX_GROUP_SIZE, max(1, -(-small_count // jobs)))
+
+    # 前処理済みのファイルのグループ（Noneは変換タスクへの終了通知）
+    prepared: asyncio.Queue[Optional[list[tuple[Path, Path]]]] = asyncio.Queue(maxsize=jobs)
+    # 変換結果（入力ファイルパスと、失敗時のエラーメッセージ）
+    results: asyncio.Queue[tuple[Path, Optional[str]]] = asyncio.Queue()
+
+    # 空き容量はバッチ開始時に一度だけ取得し、以降は推定出力サイズを差し引いて判定する
+    try:
+        ctx: Optional[BatchContext] = BatchContext.from_directory(converter.output_dir)
+    except OSError:
+        ctx = None
+
+    async def prepare() -> None:
+        group: list[tuple[Path, Path]] = []
+        # 出力先ごとに最初に割り当てた入力ファイル（a.mp4とa.mkvのような出力先の重複を検出する）
+        claimed: dict[str, Path] = {}
+        for path in video_files:
+            try:
+                output_path = await loop.run_in_executor(None, converter.prepare_output, path, ctx)
+            except VideoConverterError as e:
+                await results.put((path, str(e)))
+                continue
+            except Exception as e:
+                await results.put((path, f"予期しないエラー: {e}"))
+                continue
+            # 同じ出力先に複数のFFmpegが同時に書き込むと出力が壊れるため、2つ目以降は変換しない
+            owner = claimed.setdefault(os.path.normcase(output_path), path)
+            if owner != path:
+                await results.put(
+                    (path, f"出力先が{owner.name}と重複するため変換しません (ファイル: {path})")
+                )
+                continue
+            # キューが一杯の間は待機し、前処理が変換より先行しすぎないようにする
+            if sizes[path] > GROUP_FILE_SIZE_LIMIT:
+                await prepared.put([(path, output_path)])
+                continue
+            group.append((path, output_path))
+            if len(group) >= group_size:
+                await prepared.put(group)
+                group = []
+
+        if group:
+            await prepared.put(group)
+        for _ in range(jobs):
+            await prepared.put(None)
+
+    async def encode() -> None:
+        while (group := await prepared.get()) is not None:
+            if len(group) > 1:
+                try:
+                    await converter.encode_group_async(group)
+                except Exception:
+                    # どの出力も完成していないため、すべてのファイルを個別に変換し直す
+                    pass
+                else:
+                    for path, _ in group:
+                        await results.put((path, None))
+                    continue
+
+            for path, output_path in group:
+                error: Optional[str] = None
+                try:
+                    await converter.encode_async(path, output_path)
+                except VideoConverterError as e:
+                    error = str(e)
+                except Exception as e:
+                    error = f"予期しないエラー: {e}"
+                await results.put((path, error))
+
+    async def report(progress: Progress, task: TaskID) -> int:
+        success_count = 0
+        for _ in video_files:
+            path, error = await results.get()
+            if error is None:
+                success_count += 1
+                print_success(f"変換完了: {path.name}")
+            else:
+                print_error(error)
+            progress.advance(task)
+        return success_count
+
+    with Progress(console=console) as progress:
+        task = progress.add_task("変換中...", total=len(video_files))
+        reporter = asyncio.ensure_future(report(progress, task))
+        await asyncio.gather(prepare(), *(encode() for _ in range(jobs)))
+        return await reporter
+
+
+def _file_size(file_path: Path) -> int:
+    """
+    ファイルサイズを取得する（取得できない場合は0）
+
+    Args:
+        file_path: ファイルパス
+
+    Returns:
+        int: ファイルサイズ（バイト）
+    """
+    try:
+        return file_path.stat().st_size
+    except OSError:
+        return 0
+
+
+def default_jobs() -> int:
+    """
+    全ファイル変換時の既定の並列ジョブ数を返す
+
+    FFmpegは-threads 0で入力のデコードを複数スレッドで行うため、CPUコア数と同じ数の
+    プロセスを起動するとスレッドが過剰になる。コア数の半分（最低1）とする。
+
+    Returns:
+        int: 並列ジョブ数
+    """
+    return max(1, (os.cpu_count() or 1) // 2)
+
+
+async def _input_async(prompt: str) -> str:
+    """
+    イベントループを止めずに標準入力から1行読み込む
+
+    input()はデーモンスレッドで実行する。スレッドプールを使うと、入力待ちの間に
+    Ctrl+Cで終了した際にインタープリタ終了時のスレッド待ち合わせで停止してしまうため。
+
+    Args:
+        prompt: 入力プロンプト
+
+    Returns:
+        str: 入力された文字列
+
+    Raises:
+        EOFError: 標準入力が閉じられた場合
+    """
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[str] = loop.create_future()
+
+    def set_result(line: str) -> None:
+        if not future.done():
+            future.set_result(line)
+
+    def set_exception(error: BaseException) -> None:
+        if not future.done():
+            future.set_exception(error)
+
+    def read() -> None:
+        try:
+            line = input(prompt)
+        except BaseException as e:
+            deliver = functools.partial(set_exception, e)
+        else:
+            deliver = functools.partial(set_result, line)
+
+        # 入力前にイベントループが終了している場合は結果を捨てる
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(deliver)
+
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
+
+async def convert_interactive(
+    converter: VideoToAudioConverter, jobs: int = 1, show_info: bool = False
+) -> None:
+    """
+    対話的モードで変換を実行する
+
+    入力待ちや単一ファイルの変換中もイベントループを止めないよう、非同期に実行する。
+
+    Args:
+        converter: コンバーターインスタンス
+        jobs: 全ファイル変換時に同時に起動するFFmpegプロセス数
+        show_info: 全ファイル変換時にも変換前のファイル情報を表示するかどうか
+    """
+    loop = asyncio.get_running_loop()
     movie_dir = Path("movie")
 
     if not movie_dir.exists():
@@ -193,18 +456,21 @@ def convert_interactive(converter: VideoToAudioConverter) -> None:
             "（0で終了、'all'で全ファイル変換）:[/cyan]"
         )
         try:
-            user_input = input("番号: ").strip().lower()
+            user_input = (await _input_async("番号: ")).strip().lower()
 
             if user_input in ("0", "exit", "quit"):
                 console.print("[yellow]終了します。[/yellow]")
                 break
             elif user_input == "all":
-                # 全ファイル変換
-                success_count = 0
-                for file_path in video_files:
-                    console.print(f"\n[bold]=== {file_path.name} を変換中 ===[/bold]")
-                    if convert_single_file(file_path, converter, show_info=True):
-                        success_count += 1
+                # 全ファイル変換（ファイルごとに独立したFFmpeg処理のため並列実行）
+                console.print(
+                    f"\n[bold]=== {len(video_files)}ファイルを並列変換中 "
+                    f"(ジョブ数: {jobs}) ===[/bold]"
+                )
+                # ファイル情報の取得はffprobeの起動を伴うため、--info指定時のみ行う
+                if show_info:
+                    await loop.run_in_executor(None, print_file_infos, video_files, converter, jobs)
+                success_count = await _convert_all_async(video_files, converter, jobs)
 
                 print_success(
                     f"全{len(video_files)}ファイル中{success_count}ファイルの変換が完了しました。"
@@ -216,15 +482,14 @@ def convert_interactive(converter: VideoToAudioConverter) -> None:
                 if 1 <= file_num <= len(video_files):
                     selected_file = video_files[file_num - 1]
                     console.print(f"\n[bold]=== {selected_file.name} を変換中 ===[/bold]")
-                    convert_single_file(selected_file, converter, show_info=True)
+                    await loop.run_in_executor(
+                        None, convert_single_file, selected_file, converter, True
+                    )
                 else:
                     print_error("無効な番号です。")
 
         except ValueError:
             print_error("有効な番号を入力してください。")
-        except KeyboardInterrupt:
-            console.print("\n\n[yellow]変換を中断しました。[/yellow]")
-            break
 
 
 @app.command()
@@ -253,11 +518,42 @@ def convert(
         bool,
         typer.Option("--info", help="変換前にファイル情報を表示"),
     ] = False,
+    force_reencode: Annotated[
+        bool,
+        typer.Option(
+            "--force-reencode",
+            help="音声がすでにMP3の場合も指定ビットレートで再エンコード",
+        ),
+    ] = False,
+    jobs: Annotated[
+        Optional[int],
+        typer.Option(
+            "-j",
+            "--jobs",
+            min=1,
+            help="全ファイル変換時の並列ジョブ数（デフォルト: CPUコア数の半分）",
+        ),
+    ] = None,
+    verbose: Annotated[
+        bool,
+        typer.Option("-v", "--verbose", help="FFmpegの詳細ログを出力（デバッグ用）"),
+    ] = False,
+    backend: Annotated[
+        str,
+        typer.Option("--backend", help="変換方法（ffmpeg, pyav）"),
+    ] = "ffmpeg",
 ) -> None:
     """動画ファイルをMP3に変換します。"""
+    _init_windows_console()
+
     # ビットレート検証
-    if bitrate not in ("128k", "192k", "256k", "320k"):
-        print_error(f"無効なビットレート: {bitrate}. 利用可能: 128k, 192k, 256k, 320k")
+    if bitrate not in VALID_BITRATES:
+        available = ", ".join(sorted(VALID_BITRATES, key=lambda b: int(b.rstrip("k"))))
+        print_error(f"無効なビットレート: {bitrate}. 利用可能: {available}")
+        raise typer.Exit(1)
+
+    if backend not in ("ffmpeg", "pyav"):
+        print_error(f"無効な変換方法: {backend}. 利用可能: ffmpeg, pyav")
         raise typer.Exit(1)
 
     # ファイル一覧表示のみ
@@ -276,7 +572,15 @@ def convert(
     try:
         # コンバーター初期化
         print_progress(f"MP3変換ツールを初期化中... (ビットレート: {bitrate})")
-        converter = VideoToAudioConverter(output_dir=output, bitrate=bitrate)
+        converter = VideoToAudioConverter(
+            output_dir=output,
+            bitrate=bitrate,
+            force_reencode=force_reencode,
+            verbose=verbose,
+            backend=backend,
+        )
+        if converter.backend != backend:
+            print_progress("PyAVがインストールされていないため、FFmpegで変換します")
         print_success("初期化完了")
 
         # 特定ファイル変換
@@ -296,7 +600,10 @@ def convert(
         # 対話的モード
         else:
             print_success("対話的モードで開始します")
-            convert_interactive(converter)
+            try:
+                asyncio.run(convert_interactive(converter, jobs or default_jobs(), show_info=info))
+            except KeyboardInterrupt:
+                console.print("\n\n[yellow]変換を中断しました。[/yellow]")
 
     except typer.Exit:
         # typer.Exitはそのまま再発生（正常な終了処理）
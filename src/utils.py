@@ -6,7 +6,7 @@
     - FFmpeg検証: システムにFFmpegがインストールされているか確認
     - ファイル検索: サポートされている動画ファイルの検索と一覧取得
     - パス生成: 入力ファイルから出力ファイルパスを自動生成
-    - ディスク管理: 空き容量チェック、出力ディレクトリ作成
+    - ディスク管理: 空き容量チェック（一括変換時はBatchContextで集計）、出力ディレクトリ作成
     - ファイルサイズフォーマット: 人間が読みやすい形式への変換
 
 サポート形式:
@@ -19,40 +19,83 @@
     # 動画ファイルの検索
     video_files = get_video_files(Path("movie"))
 
+    # サイズも合わせて取得する場合
+    for path, size in scan_video_files(Path("movie")):
+        ...
+
     # 出力パスの生成
     output_path = get_output_path(Path("input.mp4"), Path("output"))
 """
 
+import functools
+import os
 import shutil
 import subprocess
+import sys
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 from src.exceptions import FFmpegNotFoundError, InsufficientSpaceError
 
-# サポートする動画形式
-SUPPORTED_VIDEO_FORMATS = {
-    ".mp4",
-    ".avi",
-    ".mov",
-    ".mkv",
-    ".wmv",
-    ".flv",
-    ".webm",
-    ".m4v",
-    ".3gp",
-    ".ts",
-    ".mts",
-    ".m2ts",
-}
-
-
-def check_ffmpeg_installed() -> bool:
+# サポートする動画形式（すべて小文字）
+SUPPORTED_VIDEO_FORMATS = frozenset(
+    {
+        ".mp4",
+        ".avi",
+        ".mov",
+        ".mkv",
+        ".wmv",
+        ".flv",
+        ".webm",
+        ".m4v",
+        ".3gp",
+        ".ts",
+        ".mts",
+        ".m2ts",
+    }
+)
+
+# str.endswith()にまとめて渡すための拡張子のタプル
+_SUPPORTED_SUFFIXES = tuple(SUPPORTED_VIDEO_FORMATS)
+
+# 指定可能なMP3のビットレート
+VALID_BITRATES = frozenset({"128k", "192k", "256k", "320k"})
+
+# format_file_sizeで使用する単位（1024倍ごと）
+FILE_SIZE_UNITS = ("B", "KB", "MB", "GB")
+
+
+@functools.cache
+def find_ffmpeg() -> Optional[str]:
+    """
+    PATHからFFmpegの実行ファイルを探す
+
+    結果はプロセス内でキャッシュされる。
+
+    Returns:
+        Optional[str]: 実行ファイルの絶対パス（見つからない場合はNone）
+    """
+    return shutil.which("ffmpeg")
+
+
+@functools.cache
+def check_ffmpeg_installed(verify_runtime: bool = False) -> bool:
     """
     FFmpegがインストールされているかチェックする
 
+    通常はPATHを検索するだけでプロセスを起動しない。結果はプロセス内でキャッシュされるため、
+    コンバーターを複数生成してもチェックは1回しか行われない。
+
+    Args:
+        verify_runtime: Trueの場合は実際に`ffmpeg -version`を実行して動作を確認する
+
     Returns:
         bool: インストールされている場合True
     """
+    if not verify_runtime:
+        return find_ffmpeg() is not None
+
     try:
         subprocess.run(["ffmpeg", "-version"], capture_output=True, check=True)
         return True
@@ -60,14 +103,17 @@ def check_ffmpeg_installed() -> bool:
         return False
 
 
-def validate_ffmpeg() -> None:
+def validate_ffmpeg(verify_runtime: bool = False) -> None:
     """
     FFmpegの存在を検証し、なければ例外を発生させる
 
+    Args:
+        verify_runtime: Trueの場合は実際に`ffmpeg -version`を実行して動作を確認する
+
     Raises:
         FFmpegNotFoundError: FFmpegがインストールされていない場合
     """
-    if not check_ffmpeg_installed():
+    if not check_ffmpeg_installed(verify_runtime):
         raise FFmpegNotFoundError(
             "FFmpegがインストールされていません。\n"
             "以下のサイトからダウンロードしてインストールしてください:\n"
@@ -85,28 +131,72 @@ def is_supported_video_format(file_path: Path) -> bool:
     Returns:
         bool: サポートされている場合True
     """
-    return file_path.suffix.lower() in SUPPORTED_VIDEO_FORMATS
+    return _ext_supported(file_path.name)
 
 
-def get_video_files(directory: Path) -> list[Path]:
+def _ext_supported(name: str) -> bool:
     """
-    指定されたディレクトリからサポートされている動画ファイルを取得する
+    ファイル名の拡張子がサポートされている動画形式かチェックする
+
+    Path.suffixの切り出しを行わず、拡張子のタプルを渡したstr.endswith()で一度に判定する。
+    ディレクトリ走査のようにエントリ数だけ呼ばれる箇所では、ファイル名の文字列に対して直接使用する。
+
+    Args:
+        name: ファイル名
+
+    Returns:
+        bool: サポートされている場合True
+    """
+    # ".mp4"のようなドットファイルはPath.suffixと同様に拡張子なしとして扱う
+    return name.lower().endswith(_SUPPORTED_SUFFIXES) and name.rfind(".") > 0
+
+
+def scan_video_files(directory: Path) -> list[tuple[Path, Optional[int]]]:
+    """
+    指定されたディレクトリからサポートされている動画ファイルとそのサイズを取得する
+
+    走査時に取得したサイズを返すため、一覧表示などで改めてstatを呼び出す必要がない。
 
     Args:
         directory: 検索するディレクトリ
 
     Returns:
-        List[Path]: 動画ファイルのパスのリスト
+        list[tuple[Path, Optional[int]]]: 動画ファイルのパスとサイズ（バイト、取得できない場合None）の
+            組のリスト
     """
-    if not directory.exists() or not directory.is_dir():
+    # os.scandirはディレクトリエントリの種別をOSから直接取得できるため、
+    # Path.iterdir()と違いファイルごとのstat呼び出しやPath生成を省ける。
+    # ディレクトリの存在確認も事前のstatではなくscandirの失敗で判定する
+    video_files: list[tuple[Path, Optional[int]]] = []
+    try:
+        entries = os.scandir(directory)
+    except (FileNotFoundError, NotADirectoryError):
         return []
 
-    video_files = []
-    for file_path in directory.iterdir():
-        if file_path.is_file() and is_supported_video_format(file_path):
-            video_files.append(file_path)
+    with entries:
+        for entry in entries:
+            if _ext_supported(entry.name) and entry.is_file():
+                # DirEntry.stat()の結果はエントリにキャッシュされる（Windowsでは走査時に取得済み）
+                try:
+                    size: Optional[int] = entry.stat().st_size
+                except OSError:
+                    size = None
+                video_files.append((Path(entry.path), size))
+
+    return sorted(video_files, key=lambda item: item[0])
 
-    return sorted(video_files)
+
+def get_video_files(directory: Path) -> list[Path]:
+    """
+    指定されたディレクトリからサポートされている動画ファイルを取得する
+
+    Args:
+        directory: 検索するディレクトリ
+
+    Returns:
+        List[Path]: 動画ファイルのパスのリスト
+    """
+    return [path for path, _ in scan_video_files(directory)]
 
 
 def get_output_path(input_path: Path, output_dir: Path) -> Path:
@@ -124,17 +214,86 @@ def get_output_path(input_path: Path, output_dir: Path) -> Path:
     return output_dir / output_name
 
 
-def check_disk_space(file_path: Path, required_space_mb: int = 100) -> None:
+def get_cache_directory() -> Path:
+    """
+    ユーザーごとのキャッシュディレクトリを返す
+
+    Linuxなどでは$XDG_CACHE_HOME（未設定の場合は~/.cache）、macOSでは~/Library/Caches、
+    Windowsでは%LOCALAPPDATA%の下のmp4tomp3ディレクトリを使用する。
+
+    Returns:
+        Path: キャッシュディレクトリのパス（存在するとは限らない）
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = str(Path.home() / "Library" / "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "mp4tomp3"
+
+
+@dataclass
+class BatchContext:
+    """
+    一括変換中の空き容量を追跡するコンテキスト
+
+    バッチ開始時に一度だけ空き容量を取得し、以降は変換を受け付けるたびに
+    推定出力サイズを差し引くことで、ファイルごとのdisk_usage呼び出しを省く。
+
+    Attributes:
+        free_bytes: 残りの空き容量（バイト）
+    """
+
+    free_bytes: int
+
+    @classmethod
+    def from_directory(cls, directory: Path) -> "BatchContext":
+        """
+        ディレクトリの現在の空き容量からコンテキストを作成する
+
+        Args:
+            directory: 出力ディレクトリ
+
+        Returns:
+            BatchContext: 作成したコンテキスト
+
+        Raises:
+            OSError: 空き容量を取得できない場合
+        """
+        return cls(free_bytes=shutil.disk_usage(directory).free)
+
+
+def check_disk_space(
+    file_path: Path, required_space_mb: int = 100, ctx: Optional[BatchContext] = None
+) -> int:
     """
     十分な空き容量があるかチェックする
 
     Args:
         file_path: チェック対象のディスクパス
         required_space_mb: 必要な空き容量（MB）
+        ctx: 一括変換用のコンテキスト。指定した場合はディスクに問い合わせず、
+            記録済みの空き容量で判定して必要量を差し引く
+
+    Returns:
+        int: 必要量を確保した後の残りの空き容量（バイト）
 
     Raises:
         InsufficientSpaceError: 空き容量が不足している場合
     """
+    required_bytes = required_space_mb * 1024 * 1024
+
+    if ctx is not None:
+        free_space_mb = ctx.free_bytes / (1024 * 1024)
+        if free_space_mb < required_space_mb:
+            raise InsufficientSpaceError(
+                f"空き容量が不足しています。必要: {required_space_mb}MB, "
+                f"利用可能: {free_space_mb:.1f}MB"
+            )
+        ctx.free_bytes -= required_bytes
+        return ctx.free_bytes
+
     try:
         disk_usage = shutil.disk_usage(file_path.parent)
         free_space_mb = disk_usage.free / (1024 * 1024)
@@ -147,6 +306,8 @@ def check_disk_space(file_path: Path, required_space_mb: int = 100) -> None:
     except OSError as e:
         raise InsufficientSpaceError(f"容量チェック中にエラーが発生しました: {e}") from e
 
+    return int(disk_usage.free) - required_bytes
+
 
 def format_file_size(size_bytes: int) -> str:
     """
@@ -158,14 +319,11 @@ def format_file_size(size_bytes: int) -> str:
     Returns:
         str: フォーマットされたファイルサイズ
     """
-    if size_bytes < 1024:
+    # ビット長から1024の何乗の単位かを求める（GB以上はGBで表示）
+    unit = min(max(0, (size_bytes.bit_length() - 1) // 10), len(FILE_SIZE_UNITS) - 1)
+    if unit == 0:
         return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+    return f"{size_bytes / (1 << (10 * unit)):.1f} {FILE_SIZE_UNITS[unit]}"
 
 
 def create_output_directory(output_dir: Path) -> None:
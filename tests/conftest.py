@@ -0,0 +1,48 @@
+"""テスト共通のフィクスチャ"""
+
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+import ffmpeg
+import pytest
+
+
+class FakeFFmpeg:
+    """src.converterが使用するffmpegモジュールの代用品
+
+    ffprobeを起動せずに、テストで設定した結果を返す。MagicMockとpatchの組み立てを
+    テストごとに行わずに済むよう、全テストで自動的に差し替える。
+    """
+
+    Error = ffmpeg.Error
+
+    def __init__(self) -> None:
+        self.probe_result: dict[str, Any] = {"streams": [], "format": {}}
+        self.probe_error: Optional[Exception] = None
+        self.probe_calls: list[str] = []
+
+    def probe(self, filename: str) -> dict[str, Any]:
+        self.probe_calls.append(filename)
+        if self.probe_error is not None:
+            raise self.probe_error
+        return self.probe_result
+
+
+@pytest.fixture(autouse=True)
+def fake_ffmpeg(monkeypatch: pytest.MonkeyPatch) -> FakeFFmpeg:
+    """src.converter.ffmpegを差し替え、テスト中にffprobeが起動しないようにする"""
+    fake = FakeFFmpeg()
+    monkeypatch.setattr("src.converter.ffmpeg", fake)
+    return fake
+
+
+@pytest.fixture(autouse=True)
+def probe_cache_dir(
+    monkeypatch: pytest.MonkeyPatch, tmp_path_factory: pytest.TempPathFactory
+) -> Path:
+    """ffprobe結果のキャッシュをユーザーのキャッシュディレクトリではなく一時ディレクトリに保存する"""
+    # ディレクトリはキャッシュの書き込み時に作成されるため、ここでは作成しない
+    cache_dir = tmp_path_factory.getbasetemp() / "probe_cache" / uuid.uuid4().hex
+    monkeypatch.setattr("src.converter.PROBE_CACHE_DIR", cache_dir)
+    return cache_dir
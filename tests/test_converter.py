@@ -1,12 +1,23 @@
 """VideoToAudioConverterクラスのテスト"""
 
+import asyncio
+import errno
+import io
+import os
+import subprocess
+import sys
 from pathlib import Path
 from typing import Any
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src.converter import VideoToAudioConverter
+from src.converter import (
+    STDERR_BUFFER_SIZE,
+    VideoToAudioConverter,
+    _probe_cached,
+    _wait_and_drain_stderr,
+)
 from src.exceptions import (
     ConversionError,
     FileInUseError,
@@ -15,6 +26,59 @@ from src.exceptions import (
     PermissionError,
     UnsupportedFormatError,
 )
+from tests.conftest import FakeFFmpeg
+
+
+class _FakeProcess:
+    """subprocess.Popenが返すFFmpegプロセスの代用品"""
+
+    def __init__(self, returncode: int, stderr: bytes) -> None:
+        self.returncode = returncode
+        self.stderr = io.BytesIO(stderr)
+
+    def wait(self) -> int:
+        return self.returncode
+
+
+class _FakePopen:
+    """subprocess.Popenの代用品（起動したコマンドを記録し、設定した結果を返す）
+
+    MagicMockを使わず素のクラスにすることで、テストごとのモック生成と属性アクセスの
+    コストを省く。
+    """
+
+    def __init__(self) -> None:
+        self.commands: list[list[str]] = []
+        self.returncode = 0
+        self.stderr = b""
+
+    def __call__(self, command: list[str], **_kwargs: Any) -> _FakeProcess:
+        self.commands.append(command)
+        return _FakeProcess(self.returncode, self.stderr)
+
+
+@pytest.fixture
+def fake_popen(monkeypatch: pytest.MonkeyPatch) -> _FakePopen:
+    """FFmpegを起動せずにコマンドを記録するPopen"""
+    popen = _FakePopen()
+    monkeypatch.setattr("src.converter.subprocess.Popen", popen)
+    return popen
+
+
+@pytest.fixture(autouse=True)
+def clear_probe_cache() -> Any:
+    """テスト間でffprobe結果のメモリキャッシュを共有しない"""
+    _probe_cached.cache_clear()
+    yield
+    _probe_cached.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def dummy_mp4(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """変換テスト用の入力ファイル（モジュール内で共有するため、テストで変更しないこと）"""
+    path = tmp_path_factory.mktemp("videos") / "input.mp4"
+    path.write_bytes(b"dummy video data")
+    return path
 
 
 @pytest.fixture
@@ -33,10 +97,10 @@ def mock_create_output_directory() -> Any:
 
 @pytest.fixture
 def converter(
-    tmp_path: Path, mock_validate_ffmpeg: Any, mock_create_output_directory: Any
+    mock_validate_ffmpeg: Any, mock_create_output_directory: Any
 ) -> VideoToAudioConverter:
-    """テスト用のコンバーターインスタンス"""
-    return VideoToAudioConverter(output_dir=tmp_path / "output", bitrate="192k")
+    """テスト用のコンバーターインスタンス（出力ディレクトリは作成しない）"""
+    return VideoToAudioConverter(output_dir=Path("output"), bitrate="192k")
 
 
 class TestConverterInitialization:
@@ -51,10 +115,10 @@ class TestConverterInitialization:
         assert converter.bitrate == "192k"
 
     def test_init_custom_params(
-        self, tmp_path: Path, mock_validate_ffmpeg: Any, mock_create_output_directory: Any
+        self, mock_validate_ffmpeg: Any, mock_create_output_directory: Any
     ) -> None:
         """カスタムパラメータでの初期化"""
-        output_dir = tmp_path / "custom_output"
+        output_dir = Path("custom_output")
         converter = VideoToAudioConverter(output_dir=output_dir, bitrate="320k")
         assert converter.output_dir == output_dir
         assert converter.bitrate == "320k"
@@ -66,12 +130,19 @@ class TestConverterInitialization:
             VideoToAudioConverter()
             mock_validate.assert_called_once()
 
+    @patch("src.converter.validate_ffmpeg")
+    def test_init_skip_ffmpeg_check(self, mock_validate: MagicMock) -> None:
+        """FFmpegの存在確認を省略できる"""
+        with patch("src.converter.create_output_directory"):
+            VideoToAudioConverter(skip_ffmpeg_check=True)
+            mock_validate.assert_not_called()
+
     @patch("src.converter.create_output_directory")
     def test_init_creates_output_directory(
-        self, mock_create: MagicMock, mock_validate_ffmpeg: Any, tmp_path: Path
+        self, mock_create: MagicMock, mock_validate_ffmpeg: Any
     ) -> None:
         """初期化時に出力ディレクトリを作成"""
-        output_dir = tmp_path / "output"
+        output_dir = Path("output")
         VideoToAudioConverter(output_dir=output_dir)
         mock_create.assert_called_once_with(output_dir)
 
@@ -82,10 +153,10 @@ class TestConvertFile:
     def test_convert_file_not_exists(self, converter: VideoToAudioConverter) -> None:
         """存在しないファイルの変換"""
         non_existent = Path("nonexistent.mp4")
-        with pytest.raises(FileNotFoundError) as exc_info:
+        with pytest.raises(FileNotFoundError, match="入力ファイルが見つかりません"):
             converter.convert_file(non_existent)
-        assert "入力ファイルが見つかりません" in str(exc_info.value)
 
+    @pytest.mark.fs
     def test_convert_file_unsupported_format(
         self, converter: VideoToAudioConverter, tmp_path: Path
     ) -> None:
@@ -93,198 +164,605 @@ class TestConvertFile:
         text_file = tmp_path / "test.txt"
         text_file.touch()
 
-        with pytest.raises(UnsupportedFormatError) as exc_info:
+        with pytest.raises(UnsupportedFormatError, match="対応していない形式"):
+            converter.convert_file(text_file)
+
+    @pytest.mark.fs
+    @patch("src.converter.check_disk_space")
+    @patch("src.converter.get_output_path")
+    def test_convert_file_unsupported_format_rejected_early(
+        self,
+        mock_get_output: MagicMock,
+        mock_check_space: MagicMock,
+        converter: VideoToAudioConverter,
+        tmp_path: Path,
+    ) -> None:
+        """対応していない形式は出力パスの生成や容量チェックの前に拒否する"""
+        text_file = tmp_path / "test.txt"
+        text_file.touch()
+
+        with pytest.raises(UnsupportedFormatError):
             converter.convert_file(text_file)
-        assert "対応していない形式" in str(exc_info.value)
+        mock_get_output.assert_not_called()
+        mock_check_space.assert_not_called()
 
-    @patch("src.converter.ffmpeg")
+    @pytest.mark.fs
     @patch("src.converter.check_disk_space")
     @patch("src.converter.get_output_path")
     def test_convert_file_success(
         self,
         mock_get_output: MagicMock,
         mock_check_space: MagicMock,
-        mock_ffmpeg: MagicMock,
+        fake_popen: _FakePopen,
         converter: VideoToAudioConverter,
+        dummy_mp4: Path,
         tmp_path: Path,
     ) -> None:
         """正常な変換"""
-        input_file = tmp_path / "input.mp4"
-        input_file.write_text("dummy video data")
+        input_file = dummy_mp4
         output_file = tmp_path / "output.mp3"
         mock_get_output.return_value = output_file
 
-        # ffmpeg-pythonのモック設定
-        mock_stream = MagicMock()
-        mock_ffmpeg.input.return_value = mock_stream
-        mock_ffmpeg.output.return_value = mock_stream
-        mock_ffmpeg.overwrite_output.return_value = mock_stream
-
         result = converter.convert_file(input_file)
 
         assert result == output_file
-        mock_ffmpeg.input.assert_called_once_with(str(input_file))
-        mock_ffmpeg.run.assert_called_once()
-
-    @patch("src.converter.ffmpeg")
+        assert len(fake_popen.commands) == 1
+        command = fake_popen.commands[0]
+        assert Path(command[0]).stem.lower() == "ffmpeg"
+        assert command[command.index("-i") + 1] == str(input_file)
+        # 入力デコードのスレッド数は-iより前に指定する
+        assert command.index("-threads") < command.index("-i")
+        assert command[command.index("-ab") + 1] == "192k"
+        assert command[-1] == str(output_file)
+
+    @pytest.mark.fs
     @patch("src.converter.check_disk_space")
     @patch("src.converter.get_output_path")
     def test_convert_file_with_progress_callback(
         self,
         mock_get_output: MagicMock,
         mock_check_space: MagicMock,
-        mock_ffmpeg: MagicMock,
+        fake_popen: _FakePopen,
         converter: VideoToAudioConverter,
+        dummy_mp4: Path,
         tmp_path: Path,
     ) -> None:
         """進行状況コールバック付き変換"""
-        input_file = tmp_path / "input.mp4"
-        input_file.write_text("dummy")
+        input_file = dummy_mp4
         output_file = tmp_path / "output.mp3"
         mock_get_output.return_value = output_file
 
-        mock_stream = MagicMock()
-        mock_ffmpeg.input.return_value = mock_stream
-        mock_ffmpeg.output.return_value = mock_stream
-        mock_ffmpeg.overwrite_output.return_value = mock_stream
-
         callback = MagicMock()
         converter.convert_file(input_file, progress_callback=callback)
 
         # コールバックが2回呼ばれたことを確認
         assert callback.call_count >= 2
+        assert len(fake_popen.commands) == 1
 
-    @patch("src.converter.ffmpeg")
+    @pytest.mark.fs
     @patch("src.converter.check_disk_space")
     @patch("src.converter.get_output_path")
     def test_convert_file_permission_error(
         self,
         mock_get_output: MagicMock,
         mock_check_space: MagicMock,
-        mock_ffmpeg: MagicMock,
+        fake_popen: _FakePopen,
         converter: VideoToAudioConverter,
+        dummy_mp4: Path,
         tmp_path: Path,
     ) -> None:
         """権限エラー"""
-        input_file = tmp_path / "input.mp4"
-        input_file.write_text("dummy")
+        input_file = dummy_mp4
         mock_get_output.return_value = tmp_path / "output.mp3"
 
-        # ffmpegエラーをシミュレート
-        import ffmpeg
-
-        error = ffmpeg.Error("ffmpeg", None, b"Permission denied")
-        mock_ffmpeg.input.return_value = MagicMock()
-        mock_ffmpeg.output.return_value = MagicMock()
-        mock_ffmpeg.overwrite_output.return_value = MagicMock()
-        mock_ffmpeg.run.side_effect = error
-        mock_ffmpeg.Error = ffmpeg.Error
+        # FFmpegの異常終了をシミュレート
+        fake_popen.returncode = 1
+        fake_popen.stderr = b"Permission denied"
 
-        with pytest.raises(PermissionError) as exc_info:
+        with pytest.raises(PermissionError, match="ファイルアクセス権限がありません"):
             converter.convert_file(input_file)
-        assert "ファイルアクセス権限がありません" in str(exc_info.value)
 
-    @patch("src.converter.ffmpeg")
+    @pytest.mark.fs
     @patch("src.converter.check_disk_space")
     @patch("src.converter.get_output_path")
     def test_convert_file_in_use_error(
         self,
         mock_get_output: MagicMock,
         mock_check_space: MagicMock,
-        mock_ffmpeg: MagicMock,
+        fake_popen: _FakePopen,
         converter: VideoToAudioConverter,
+        dummy_mp4: Path,
         tmp_path: Path,
     ) -> None:
         """ファイル使用中エラー"""
-        input_file = tmp_path / "input.mp4"
-        input_file.write_text("dummy")
+        input_file = dummy_mp4
         mock_get_output.return_value = tmp_path / "output.mp3"
 
-        import ffmpeg
-
-        error = ffmpeg.Error("ffmpeg", None, b"being used by another process")
-        mock_ffmpeg.input.return_value = MagicMock()
-        mock_ffmpeg.output.return_value = MagicMock()
-        mock_ffmpeg.overwrite_output.return_value = MagicMock()
-        mock_ffmpeg.run.side_effect = error
-        mock_ffmpeg.Error = ffmpeg.Error
+        fake_popen.returncode = 1
+        fake_popen.stderr = b"being used by another process"
 
-        with pytest.raises(FileInUseError) as exc_info:
+        with pytest.raises(FileInUseError, match="ファイルが他のプロセスで使用中です"):
             converter.convert_file(input_file)
-        assert "ファイルが他のプロセスで使用中です" in str(exc_info.value)
 
-    @patch("src.converter.ffmpeg")
+    @pytest.mark.fs
     @patch("src.converter.check_disk_space")
     @patch("src.converter.get_output_path")
     def test_convert_file_no_space_error(
         self,
         mock_get_output: MagicMock,
         mock_check_space: MagicMock,
-        mock_ffmpeg: MagicMock,
+        fake_popen: _FakePopen,
         converter: VideoToAudioConverter,
+        dummy_mp4: Path,
         tmp_path: Path,
     ) -> None:
         """容量不足エラー"""
-        input_file = tmp_path / "input.mp4"
-        input_file.write_text("dummy")
+        input_file = dummy_mp4
         mock_get_output.return_value = tmp_path / "output.mp3"
 
-        import ffmpeg
+        fake_popen.returncode = 1
+        fake_popen.stderr = b"No space left on device"
 
-        error = ffmpeg.Error("ffmpeg", None, b"No space left on device")
-        mock_ffmpeg.input.return_value = MagicMock()
-        mock_ffmpeg.output.return_value = MagicMock()
-        mock_ffmpeg.overwrite_output.return_value = MagicMock()
-        mock_ffmpeg.run.side_effect = error
-        mock_ffmpeg.Error = ffmpeg.Error
-
-        with pytest.raises(InsufficientSpaceError) as exc_info:
+        with pytest.raises(InsufficientSpaceError, match="容量が不足しています"):
             converter.convert_file(input_file)
-        assert "容量が不足しています" in str(exc_info.value)
 
-    @patch("src.converter.ffmpeg")
+    @pytest.mark.fs
     @patch("src.converter.check_disk_space")
     @patch("src.converter.get_output_path")
     def test_convert_file_general_error(
         self,
         mock_get_output: MagicMock,
         mock_check_space: MagicMock,
-        mock_ffmpeg: MagicMock,
+        fake_popen: _FakePopen,
         converter: VideoToAudioConverter,
+        dummy_mp4: Path,
         tmp_path: Path,
     ) -> None:
         """一般的な変換エラー"""
-        input_file = tmp_path / "input.mp4"
-        input_file.write_text("dummy")
+        input_file = dummy_mp4
         mock_get_output.return_value = tmp_path / "output.mp3"
 
-        import ffmpeg
+        fake_popen.returncode = 1
+        fake_popen.stderr = b"Invalid codec"
 
-        error = ffmpeg.Error("ffmpeg", None, b"Invalid codec")
-        mock_ffmpeg.input.return_value = MagicMock()
-        mock_ffmpeg.output.return_value = MagicMock()
-        mock_ffmpeg.overwrite_output.return_value = MagicMock()
-        mock_ffmpeg.run.side_effect = error
-        mock_ffmpeg.Error = ffmpeg.Error
-
-        with pytest.raises(ConversionError) as exc_info:
+        with pytest.raises(ConversionError, match="変換中にエラーが発生しました"):
             converter.convert_file(input_file)
-        assert "変換中にエラーが発生しました" in str(exc_info.value)
 
 
+@pytest.mark.fs
+class TestPrepareOutput:
+    """prepare_outputメソッドのテスト"""
+
+    @patch("src.utils.shutil.disk_usage")
+    def test_disk_space_checked_once_per_directory(
+        self, mock_disk_usage: MagicMock, converter: VideoToAudioConverter, tmp_path: Path
+    ) -> None:
+        """同じ出力先への2回目以降は記録した空き容量で判定する"""
+        mock_disk_usage.return_value = MagicMock(free=1024 * 1024 * 1024)
+        files = [tmp_path / "a.mp4", tmp_path / "b.mp4"]
+        for f in files:
+            f.write_bytes(b"dummy")
+
+        for f in files:
+            converter.prepare_output(f)
+
+        mock_disk_usage.assert_called_once()
+
+    @patch("src.utils.shutil.disk_usage")
+    def test_disk_space_rechecked_when_low(
+        self, mock_disk_usage: MagicMock, converter: VideoToAudioConverter, tmp_path: Path
+    ) -> None:
+        """記録した空き容量で不足する場合は実際の空き容量を取得し直す"""
+        mock_disk_usage.return_value = MagicMock(free=15 * 1024 * 1024)
+        files = [tmp_path / "a.mp4", tmp_path / "b.mp4"]
+        for f in files:
+            f.write_bytes(b"dummy")
+
+        converter.prepare_output(files[0])
+        mock_disk_usage.return_value = MagicMock(free=1024 * 1024 * 1024)
+        converter.prepare_output(files[1])
+
+        assert mock_disk_usage.call_count == 2
+
+
+class TestCopyAudio:
+    """MP3音声のストリームコピーのテスト"""
+
+    @pytest.mark.fs
+    def test_should_copy_mp3_audio(
+        self, fake_ffmpeg: FakeFFmpeg, converter: VideoToAudioConverter, tmp_path: Path
+    ) -> None:
+        """音声がMP3の場合はコピーする"""
+        input_file = tmp_path / "input.mkv"
+        input_file.write_bytes(b"dummy")
+        fake_ffmpeg.probe_result = {
+            "streams": [
+                {"codec_type": "video", "codec_name": "h264"},
+                {"codec_type": "audio", "codec_name": "mp3", "bit_rate": "192000"},
+            ]
+        }
+
+        assert converter._should_copy_audio(input_file) is True
+
+    @pytest.mark.fs
+    def test_should_not_copy_higher_bitrate(
+        self, fake_ffmpeg: FakeFFmpeg, converter: VideoToAudioConverter, tmp_path: Path
+    ) -> None:
+        """指定より高いビットレートやビットレート不明のMP3は再エンコードする"""
+        input_file = tmp_path / "input.mkv"
+        input_file.write_bytes(b"dummy")
+        fake_ffmpeg.probe_result = {
+            "streams": [{"codec_type": "audio", "codec_name": "mp3", "bit_rate": "320000"}]
+        }
+        assert converter._should_copy_audio(input_file) is False
+
+        input_file.write_bytes(b"modified dummy")
+        fake_ffmpeg.probe_result = {"streams": [{"codec_type": "audio", "codec_name": "mp3"}]}
+        assert converter._should_copy_audio(input_file) is False
+
+    @pytest.mark.fs
+    @patch("src.converter.check_disk_space")
+    def test_convert_mp3_source_uses_copy(
+        self,
+        mock_check_space: MagicMock,
+        fake_popen: _FakePopen,
+        fake_ffmpeg: FakeFFmpeg,
+        converter: VideoToAudioConverter,
+        dummy_mp4: Path,
+    ) -> None:
+        """音声が指定ビットレートのMP3の場合はcopyでFFmpegを起動する"""
+        input_file = dummy_mp4
+        fake_ffmpeg.probe_result = {
+            "streams": [{"codec_type": "audio", "codec_name": "mp3", "bit_rate": "192000"}]
+        }
+        converter.convert_file(input_file)
+
+        command = fake_popen.commands[0]
+        assert command[command.index("-acodec") + 1] == "copy"
+        mock_check_space.assert_called_once()
+
+    @pytest.mark.fs
+    def test_should_not_copy_other_audio(
+        self, fake_ffmpeg: FakeFFmpeg, converter: VideoToAudioConverter, tmp_path: Path
+    ) -> None:
+        """MP3以外の音声やプローブ失敗時は再エンコードする"""
+        input_file = tmp_path / "input.mp4"
+        input_file.write_bytes(b"dummy")
+        fake_ffmpeg.probe_result = {"streams": [{"codec_type": "audio", "codec_name": "aac"}]}
+        assert converter._should_copy_audio(input_file) is False
+
+        input_file.write_bytes(b"modified dummy")
+        fake_ffmpeg.probe_error = Exception("Probe error")
+        assert converter._should_copy_audio(input_file) is False
+
+    def test_force_reencode_skips_probe(
+        self, fake_ffmpeg: FakeFFmpeg, converter: VideoToAudioConverter
+    ) -> None:
+        """force_reencode指定時はプローブせずに再エンコードする"""
+        converter.force_reencode = True
+        assert converter._should_copy_audio(Path("input.mp4")) is False
+        assert fake_ffmpeg.probe_calls == []
+
+
+class TestBuildCommand:
+    """FFmpegコマンドライン構築のテスト"""
+
+    @patch("src.converter.find_ffmpeg")
+    def test_build_command_uses_absolute_path(
+        self, mock_find: MagicMock, converter: VideoToAudioConverter
+    ) -> None:
+        """PATH上で見つかったFFmpegは絶対パスで起動する"""
+        mock_find.return_value = "/usr/bin/ffmpeg"
+        command = converter._build_command(Path("in.mp4"), Path("out.mp3"))
+        assert command[0] == "/usr/bin/ffmpeg"
+
+    def test_build_command_copy(self, converter: VideoToAudioConverter) -> None:
+        """コピー時はlibmp3lameを使わない"""
+        command = converter._build_command(Path("in.mkv"), Path("out.mp3"), True)
+        assert command[command.index("-acodec") + 1] == "copy"
+        assert "libmp3lame" not in command
+        assert "-ab" not in command
+
+    @pytest.mark.usefixtures("mock_validate_ffmpeg", "mock_create_output_directory")
+    def test_build_command_loglevel(self) -> None:
+        """通常はエラーのみ、verbose指定時は詳細ログを出力させる"""
+        for verbose, loglevel in ((False, "error"), (True, "info")):
+            converter = VideoToAudioConverter(output_dir=Path("output"), verbose=verbose)
+            command = converter._build_command(Path("in.mp4"), Path("out.mp3"))
+            assert "-hide_banner" in command
+            assert command[command.index("-loglevel") + 1] == loglevel
+
+    def test_build_group_command(self, converter: VideoToAudioConverter) -> None:
+        """複数ファイルは入力ごとの-iと出力ごとの-mapで1つのコマンドにまとめる"""
+        command = converter._build_group_command(
+            [
+                (Path("a.mp4"), Path("a.mp3"), False),
+                (Path("b.mkv"), Path("b.mp3"), True),
+            ]
+        )
+        assert command.count("-i") == 2
+        a_output = command.index(str(Path("a.mp3")))
+        assert command[a_output - 8 : a_output - 4] == ["-map", "0:a:0", "-acodec", "libmp3lame"]
+        b_output = command.index(str(Path("b.mp3")))
+        assert command[b_output - 4 : b_output] == ["-map", "1:a:0", "-acodec", "copy"]
+
+
+class TestPyAVBackend:
+    """PyAVによる変換のテスト"""
+
+    @pytest.mark.usefixtures("mock_create_output_directory")
+    @patch("src.converter.av", None)
+    @patch("src.converter.validate_ffmpeg")
+    def test_fallback_without_pyav(self, mock_validate: MagicMock) -> None:
+        """PyAVがインストールされていない場合はFFmpegにフォールバックする"""
+        converter = VideoToAudioConverter(output_dir=Path("output"), backend="pyav")
+        assert converter.backend == "ffmpeg"
+        mock_validate.assert_called_once()
+
+    @pytest.mark.fs
+    @pytest.mark.usefixtures("mock_create_output_directory")
+    @patch("src.converter.check_disk_space")
+    @patch("src.converter.av")
+    @patch("src.converter.validate_ffmpeg")
+    def test_convert_file_in_process(
+        self,
+        mock_validate: MagicMock,
+        mock_av: MagicMock,
+        mock_check_space: MagicMock,
+        fake_popen: _FakePopen,
+        dummy_mp4: Path,
+        tmp_path: Path,
+    ) -> None:
+        """FFmpegのプロセスを起動せずに変換する"""
+        input_file = dummy_mp4
+        converter = VideoToAudioConverter(output_dir=tmp_path / "output", backend="pyav")
+
+        result = converter.convert_file(input_file)
+
+        assert result == tmp_path / "output" / "input.mp3"
+        mock_validate.assert_not_called()
+        mock_check_space.assert_called_once()
+        assert fake_popen.commands == []
+        out_stream = mock_av.open.return_value.__enter__.return_value.add_stream.return_value
+        assert out_stream.bit_rate == 192000
+
+    @patch("src.converter.av")
+    def test_encode_pyav_permission_error(
+        self, mock_av: MagicMock, converter: VideoToAudioConverter
+    ) -> None:
+        """errnoから具体的な例外に変換する"""
+        mock_av.open.side_effect = OSError(errno.EACCES, "Permission denied")
+
+        with pytest.raises(PermissionError):
+            converter._encode_pyav(Path("input.mp4"), Path("input.mp3"))
+
+    @pytest.mark.fs
+    @pytest.mark.usefixtures("mock_validate_ffmpeg", "mock_create_output_directory")
+    @patch("src.converter.av")
+    def test_get_file_info_in_process(
+        self,
+        mock_av: MagicMock,
+        fake_ffmpeg: FakeFFmpeg,
+        tmp_path: Path,
+    ) -> None:
+        """ffprobeを起動せずにコンテナのヘッダーから情報を取得する"""
+        input_file = tmp_path / "test.mp4"
+        input_file.write_bytes(b"dummy")
+
+        video = MagicMock(type="video", bit_rate=1000000)
+        video.codec_context.name = "h264"
+        audio = MagicMock(type="audio", bit_rate=128000, sample_rate=44100)
+        audio.codec_context.name = "aac"
+        container = mock_av.open.return_value.__enter__.return_value
+        container.streams = [video, audio]
+        container.format.name = "mov,mp4,m4a,3gp,3g2,mj2"
+        container.size = 10485760
+        container.duration = 120500000
+        mock_av.time_base = 1000000
+
+        converter = VideoToAudioConverter(output_dir=tmp_path / "output", backend="pyav")
+        info = converter.get_file_info(input_file)
+
+        assert fake_ffmpeg.probe_calls == []
+        assert info["video_codec"] == "h264"
+        assert info["audio_codec"] == "aac"
+        assert info["audio_bitrate"] == "128000"
+        assert info["sample_rate"] == "44100"
+        assert info["duration"] == 120.5
+        assert info["size"] == "10.0 MB"
+
+
+class TestMapFFmpegError:
+    """FFmpegエラー出力の判別のテスト"""
+
+    def test_windows_messages(self, converter: VideoToAudioConverter) -> None:
+        """Windows環境のエラーメッセージも判別できる"""
+        input_file = Path("input.mp4")
+        error = converter._map_ffmpeg_error(input_file, b"...: Access is denied.\n")
+        assert isinstance(error, PermissionError)
+
+        error = converter._map_ffmpeg_error(input_file, b"...: Device or Resource busy\n")
+        assert isinstance(error, FileInUseError)
+
+    def test_unknown_message(self, converter: VideoToAudioConverter) -> None:
+        """該当しないメッセージは一般的な変換エラー"""
+        error = converter._map_ffmpeg_error(Path("input.mp4"), b"Invalid data found")
+        assert isinstance(error, ConversionError)
+        assert "Invalid data found" in str(error)
+
+    def test_long_message_keeps_tail(self, converter: VideoToAudioConverter) -> None:
+        """長いエラー出力はメッセージに末尾のみ含める"""
+        stderr = b"frame=1\n" * 1000 + b"Invalid data found when processing input\n"
+        error = converter._map_ffmpeg_error(Path("input.mp4"), stderr)
+        assert str(error).count("frame=1") < 100
+        assert "Invalid data found when processing input" in str(error)
+
+
+@pytest.mark.fs
+class TestWaitAndDrainStderr:
+    """標準エラー出力の逐次読み出しのテスト"""
+
+    def test_drain_large_stderr(self) -> None:
+        """パイプのバッファを超える出力でも停止せずにすべて読み出せる"""
+        size = 1024 * 1024
+        process = subprocess.Popen(
+            [sys.executable, "-c", f"import sys; sys.stderr.write('x' * {size})"],
+            stderr=subprocess.PIPE,
+            bufsize=STDERR_BUFFER_SIZE,
+        )
+
+        stderr = _wait_and_drain_stderr(process)
+
+        assert process.returncode == 0
+        assert len(stderr) == size
+
+
+class TestConvertFileAsync:
+    """convert_file_asyncメソッドのテスト"""
+
+    @pytest.mark.fs
+    @patch("src.converter.asyncio.create_subprocess_exec")
+    @patch("src.converter.check_disk_space")
+    def test_convert_file_async_success(
+        self,
+        mock_check_space: MagicMock,
+        mock_exec: MagicMock,
+        converter: VideoToAudioConverter,
+        dummy_mp4: Path,
+    ) -> None:
+        """正常な非同期変換"""
+        input_file = dummy_mp4
+
+        process = MagicMock(returncode=0)
+        process.communicate = AsyncMock(return_value=(None, b""))
+        mock_exec.return_value = process
+
+        result = asyncio.run(converter.convert_file_async(input_file))
+
+        assert result == converter.output_dir / "input.mp3"
+        mock_check_space.assert_called_once()
+        args = mock_exec.call_args.args
+        assert Path(args[0]).stem.lower() == "ffmpeg"
+        assert str(input_file) in args
+
+    @pytest.mark.fs
+    @patch("src.converter.asyncio.create_subprocess_exec")
+    @patch("src.converter.check_disk_space")
+    def test_convert_file_async_permission_error(
+        self,
+        mock_check_space: MagicMock,
+        mock_exec: MagicMock,
+        converter: VideoToAudioConverter,
+        dummy_mp4: Path,
+    ) -> None:
+        """FFmpegの終了コードが0以外の場合はエラー出力から例外を判別する"""
+        input_file = dummy_mp4
+
+        process = MagicMock(returncode=1)
+        process.communicate = AsyncMock(return_value=(None, b"Permission denied"))
+        mock_exec.return_value = process
+
+        with pytest.raises(PermissionError, match="ファイルアクセス権限がありません"):
+            asyncio.run(converter.convert_file_async(input_file))
+        mock_check_space.assert_called_once()
+
+    @pytest.mark.fs
+    @patch("src.converter.asyncio.create_subprocess_exec")
+    def test_encode_group_async_single_invocation(
+        self, mock_exec: MagicMock, converter: VideoToAudioConverter, tmp_path: Path
+    ) -> None:
+        """複数ファイルを1回のFFmpeg起動で変換する"""
+        items = [(tmp_path / f"{name}.mp4", tmp_path / f"{name}.mp3") for name in "abc"]
+        process = MagicMock(returncode=0)
+        process.communicate = AsyncMock(return_value=(None, b""))
+        mock_exec.return_value = process
+
+        result = asyncio.run(converter.encode_group_async(items))
+
+        assert result == [output_path for _, output_path in items]
+        mock_exec.assert_called_once()
+        assert mock_exec.call_args.args.count("-i") == 3
+
+    @pytest.mark.fs
+    @patch("src.converter.asyncio.create_subprocess_exec")
+    def test_encode_group_async_copies_mp3_audio(
+        self,
+        mock_exec: MagicMock,
+        fake_ffmpeg: FakeFFmpeg,
+        converter: VideoToAudioConverter,
+        tmp_path: Path,
+    ) -> None:
+        """一括変換でも指定ビットレート以下のMP3の音声はコピーする"""
+        items = [(tmp_path / f"{name}.mp4", tmp_path / f"{name}.mp3") for name in "ab"]
+        for input_path, _ in items:
+            input_path.write_bytes(b"dummy")
+        fake_ffmpeg.probe_result = {
+            "streams": [{"codec_type": "audio", "codec_name": "mp3", "bit_rate": "128000"}]
+        }
+        process = MagicMock(returncode=0)
+        process.communicate = AsyncMock(return_value=(None, b""))
+        mock_exec.return_value = process
+
+        asyncio.run(converter.encode_group_async(items))
+
+        args = list(mock_exec.call_args.args)
+        assert args.count("copy") == 2
+        assert "libmp3lame" not in args
+
+    @patch("src.converter.asyncio.create_subprocess_exec")
+    def test_encode_group_async_error(
+        self, mock_exec: MagicMock, converter: VideoToAudioConverter
+    ) -> None:
+        """一括変換の失敗はConversionErrorとして通知する"""
+        items = [(Path(f"{name}.mp4"), Path(f"{name}.mp3")) for name in "ab"]
+        process = MagicMock(returncode=1)
+        process.communicate = AsyncMock(return_value=(None, b"Invalid data found"))
+        mock_exec.return_value = process
+
+        with pytest.raises(ConversionError):
+            asyncio.run(converter.encode_group_async(items))
+
+    @pytest.mark.fs
+    @patch("src.converter.asyncio.create_subprocess_exec")
+    def test_encode_group_async_error_removes_partial_outputs(
+        self, mock_exec: MagicMock, converter: VideoToAudioConverter, tmp_path: Path
+    ) -> None:
+        """失敗時はこの実行で書き込まれた出力を削除し、書き込まれていない前回の出力は残す"""
+        items = [(tmp_path / f"{name}.mp4", tmp_path / f"{name}.mp3") for name in "abc"]
+        items[0][1].write_bytes(b"previous a")
+        items[1][1].write_bytes(b"previous b")
+
+        async def communicate() -> tuple[None, bytes]:
+            # b.mp3とc.mp3を書き込み始めたところで容量不足になった状態
+            items[1][1].write_bytes(b"partial")
+            items[2][1].write_bytes(b"partial")
+            return None, b"No space left on device"
+
+        process = MagicMock(returncode=1)
+        process.communicate = communicate
+        mock_exec.return_value = process
+
+        with pytest.raises(ConversionError):
+            asyncio.run(converter.encode_group_async(items))
+
+        assert items[0][1].read_bytes() == b"previous a"
+        assert not items[1][1].exists()
+        assert not items[2][1].exists()
+
+
+@pytest.mark.fs
 class TestGetFileInfo:
     """get_file_infoメソッドのテスト"""
 
-    @patch("src.converter.ffmpeg")
     def test_get_file_info_success(
-        self, mock_ffmpeg: MagicMock, converter: VideoToAudioConverter, tmp_path: Path
+        self, fake_ffmpeg: FakeFFmpeg, converter: VideoToAudioConverter, tmp_path: Path
     ) -> None:
         """ファイル情報取得成功"""
         input_file = tmp_path / "test.mp4"
         input_file.touch()
 
         # ffmpeg.probeのモック
-        mock_ffmpeg.probe.return_value = {
+        fake_ffmpeg.probe_result = {
             "streams": [
                 {"codec_type": "video", "codec_name": "h264"},
                 {
@@ -304,15 +782,81 @@ class TestGetFileInfo:
         assert info["audio_codec"] == "aac"
         assert info["duration"] == 120.5
 
-    @patch("src.converter.ffmpeg")
+    def test_get_file_info_uses_probe_cache(
+        self, fake_ffmpeg: FakeFFmpeg, converter: VideoToAudioConverter, tmp_path: Path
+    ) -> None:
+        """更新日時とサイズが同じファイルはffprobeを再実行しない"""
+        input_file = tmp_path / "test.mp4"
+        input_file.write_bytes(b"dummy")
+        fake_ffmpeg.probe_result = {
+            "streams": [{"codec_type": "audio", "codec_name": "aac"}],
+            "format": {"size": "5", "duration": "1.0", "format_name": "mp4"},
+        }
+
+        first = converter.get_file_info(input_file)
+        second = converter.get_file_info(input_file)
+
+        assert first == second
+        assert len(fake_ffmpeg.probe_calls) == 1
+
+        # ファイルが変更されるとキャッシュは無効になる
+        input_file.write_bytes(b"modified dummy")
+        converter.get_file_info(input_file)
+        assert len(fake_ffmpeg.probe_calls) == 2
+
+    def test_get_file_info_memory_cache(
+        self,
+        fake_ffmpeg: FakeFFmpeg,
+        probe_cache_dir: Path,
+        converter: VideoToAudioConverter,
+        tmp_path: Path,
+    ) -> None:
+        """同じプロセス内ではディスク上のキャッシュも読み直さない"""
+        input_file = tmp_path / "test.mp4"
+        input_file.write_bytes(b"dummy")
+        fake_ffmpeg.probe_result = {
+            "streams": [{"codec_type": "audio", "codec_name": "aac"}],
+            "format": {"size": "5", "duration": "1.0", "format_name": "mp4"},
+        }
+
+        converter.get_file_info(input_file)
+        for cache_file in probe_cache_dir.iterdir():
+            cache_file.unlink()
+        converter.get_file_info(input_file)
+
+        assert len(fake_ffmpeg.probe_calls) == 1
+        assert _probe_cached.cache_info().hits == 1
+
+    def test_get_file_info_disk_cache_per_path(
+        self,
+        fake_ffmpeg: FakeFFmpeg,
+        probe_cache_dir: Path,
+        converter: VideoToAudioConverter,
+        tmp_path: Path,
+    ) -> None:
+        """ディスク上のキャッシュは同名の別ファイルと共有せず、出力ディレクトリにも書き込まない"""
+        inputs = [tmp_path / "x" / "test.mp4", tmp_path / "y" / "test.mp4"]
+        for input_file in inputs:
+            input_file.parent.mkdir()
+            input_file.write_bytes(b"dummy")
+            os.utime(input_file, ns=(0, 0))
+
+        for input_file in inputs:
+            converter.get_file_info(input_file)
+            _probe_cached.cache_clear()
+
+        assert len(fake_ffmpeg.probe_calls) == 2
+        assert len(list(probe_cache_dir.iterdir())) == 2
+        assert not (converter.output_dir / ".probe_cache").exists()
+
     def test_get_file_info_error(
-        self, mock_ffmpeg: MagicMock, converter: VideoToAudioConverter, tmp_path: Path
+        self, fake_ffmpeg: FakeFFmpeg, converter: VideoToAudioConverter, tmp_path: Path
     ) -> None:
         """ファイル情報取得エラー"""
         input_file = tmp_path / "test.mp4"
         input_file.touch()
 
-        mock_ffmpeg.probe.side_effect = Exception("Probe error")
+        fake_ffmpeg.probe_error = Exception("Probe error")
 
         info = converter.get_file_info(input_file)
 
@@ -337,3 +881,8 @@ class TestFormatDuration:
         """秒のみ"""
         assert converter.format_duration(45) == "00:45"
         assert converter.format_duration(0) == "00:00"
+
+    def test_format_duration_float(self, converter: VideoToAudioConverter) -> None:
+        """ffprobeが返す小数の秒数は切り捨てる"""
+        assert converter.format_duration(120.5) == "02:00"
+        assert converter.format_duration(3599.9) == "59:59"
@@ -1,5 +1,7 @@
 """例外クラスのテスト"""
 
+import pickle
+
 import pytest
 
 from src.exceptions import (
@@ -31,6 +33,20 @@ class TestVideoConverterError:
         assert "/path/to/file.mp4" in str(error)
         assert error.file_path == "/path/to/file.mp4"
 
+    def test_error_args_formatted(self) -> None:
+        """argsにも表示用の文字列が入る（Exception標準の表示と一致する）"""
+        error = VideoConverterError("テストエラー", "/path/to/file.mp4")
+        assert error.args == (str(error),)
+
+    def test_error_pickle(self) -> None:
+        """スロットの属性もpickleで復元される（サブクラスも同様）"""
+        error = PermissionError("アクセス権限がありません", "protected.mp4")
+        restored = pickle.loads(pickle.dumps(error))
+        assert type(restored) is PermissionError
+        assert restored.message == error.message
+        assert restored.file_path == error.file_path
+        assert str(restored) == str(error)
+
     def test_error_inheritance(self) -> None:
         """Exceptionを継承している"""
         error = VideoConverterError("test")
@@ -1,15 +1,37 @@
 """メインCLIのテスト"""
 
+import asyncio
 from pathlib import Path
 from typing import Any
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from typer.testing import CliRunner
-
-from src.main import app, convert_single_file, list_video_files_table
+import typer
+from click.testing import CliRunner
+
+from src.exceptions import ConversionError, FileNotFoundError
+from src.main import (
+    _convert_all_async,
+    app,
+    convert_single_file,
+    default_jobs,
+    list_video_files_table,
+    print_file_infos,
+)
 
 runner = CliRunner()
+# typerアプリからclickコマンドへの変換はinvokeのたびに行われるため、モジュールで1回だけ行う
+cli = typer.main.get_command(app)
+
+
+@pytest.fixture
+def batch_converter() -> MagicMock:
+    """一括変換用のコンバーターのモック（入力と同じ場所に拡張子.mp3で出力する）"""
+    converter = MagicMock(output_dir=Path("mp3"))
+    converter.prepare_output.side_effect = lambda p, _ctx: p.with_suffix(".mp3")
+    converter.encode_async = AsyncMock()
+    converter.encode_group_async = AsyncMock()
+    return converter
 
 
 @pytest.fixture
@@ -26,7 +48,7 @@ class TestCLIBasicCommands:
 
     def test_help_command(self) -> None:
         """ヘルプコマンド"""
-        result = runner.invoke(app, ["--help"])
+        result = runner.invoke(cli, ["--help"])
         assert result.exit_code == 0
         assert "動画ファイルをMP3に変換します" in result.stdout
 
@@ -34,7 +56,7 @@ class TestCLIBasicCommands:
     def test_list_files_option(self, mock_list: MagicMock) -> None:
         """ファイル一覧表示オプション"""
         mock_list.return_value = []
-        result = runner.invoke(app, ["-l"])
+        result = runner.invoke(cli, ["-l"])
         assert result.exit_code == 0
         mock_list.assert_called_once()
 
@@ -42,6 +64,7 @@ class TestCLIBasicCommands:
 class TestConvertCommand:
     """変換コマンドのテスト"""
 
+    @pytest.mark.fs
     @patch("src.main.VideoToAudioConverter")
     @patch("src.main.convert_single_file")
     def test_convert_specific_file(
@@ -52,7 +75,7 @@ class TestConvertCommand:
         test_file.touch()
         mock_convert.return_value = True
 
-        result = runner.invoke(app, ["-f", str(test_file)])
+        result = runner.invoke(cli, ["-f", str(test_file)])
 
         # converter が初期化されたことを確認
         mock_converter_class.assert_called_once()
@@ -60,10 +83,11 @@ class TestConvertCommand:
 
     def test_convert_nonexistent_file(self) -> None:
         """存在しないファイルを指定"""
-        result = runner.invoke(app, ["-f", "nonexistent.mp4"])
+        result = runner.invoke(cli, ["-f", "nonexistent.mp4"])
         assert result.exit_code == 1
         assert "ファイルが見つかりません" in result.stdout
 
+    @pytest.mark.fs
     @patch("src.main.VideoToAudioConverter")
     def test_convert_unsupported_format(
         self, mock_converter_class: MagicMock, tmp_path: Path
@@ -72,7 +96,7 @@ class TestConvertCommand:
         test_file = tmp_path / "test.txt"
         test_file.touch()
 
-        result = runner.invoke(app, ["-f", str(test_file)])
+        result = runner.invoke(cli, ["-f", str(test_file)])
         assert result.exit_code == 1
         assert "対応していない形式" in result.stdout
 
@@ -83,9 +107,10 @@ class TestConvertCommand:
 
     def test_convert_invalid_bitrate(self) -> None:
         """無効なビットレート"""
-        result = runner.invoke(app, ["-b", "999k"])
+        result = runner.invoke(cli, ["-b", "999k"])
         assert result.exit_code == 1
         assert "無効なビットレート" in result.stdout
+        assert "128k, 192k, 256k, 320k" in result.stdout
 
     @pytest.mark.skip(reason="CLI integration test - requires full mocking setup")
     def test_convert_with_custom_output(self) -> None:
@@ -96,14 +121,15 @@ class TestConvertCommand:
 class TestListVideoFilesTable:
     """list_video_files_table関数のテスト"""
 
-    @patch("src.main.get_video_files")
-    def test_list_empty_directory(self, mock_get_files: MagicMock, tmp_path: Path) -> None:
+    @patch("src.main.scan_video_files")
+    def test_list_empty_directory(self, mock_get_files: MagicMock) -> None:
         """空のディレクトリ"""
         mock_get_files.return_value = []
-        result = list_video_files_table(tmp_path)
+        result = list_video_files_table(Path("movie"))
         assert result == []
 
-    @patch("src.main.get_video_files")
+    @pytest.mark.fs
+    @patch("src.main.scan_video_files")
     def test_list_with_files(self, mock_get_files: MagicMock, tmp_path: Path) -> None:
         """ファイルが存在する場合"""
         test_files = [
@@ -113,13 +139,14 @@ class TestListVideoFilesTable:
         for f in test_files:
             f.write_text("dummy content")
 
-        mock_get_files.return_value = test_files
+        mock_get_files.return_value = [(test_files[0], 13), (test_files[1], None)]
         result = list_video_files_table(tmp_path)
 
         assert len(result) == 2
         assert result == test_files
 
 
+@pytest.mark.fs
 class TestConvertSingleFile:
     """convert_single_file関数のテスト"""
 
@@ -178,6 +205,188 @@ class TestConvertSingleFile:
         assert result is True  # 変換は成功
 
 
+class TestPrintFileInfos:
+    """複数ファイルの情報表示のテスト"""
+
+    def test_print_file_infos(self, mock_converter: Any) -> None:
+        """すべてのファイルの情報を取得する"""
+        files = [Path("a.mp4"), Path("b.mp4")]
+        mock_converter.get_file_info.return_value = {"error": "情報取得失敗"}
+
+        print_file_infos(files, mock_converter, jobs=2)
+
+        assert sorted(c.args[0] for c in mock_converter.get_file_info.call_args_list) == files
+
+
+class TestConvertAllFiles:
+    """並列一括変換のテスト"""
+
+    @patch("src.main.GROUP_FILE_SIZE_LIMIT", -1)
+    def test_convert_all_counts_successes(self, batch_converter: MagicMock) -> None:
+        """成功したファイル数を返す"""
+        files = [Path("a.mp4"), Path("b.mp4"), Path("c.mp4")]
+        batch_converter.encode_async.side_effect = [None, ConversionError("変換失敗"), None]
+
+        assert asyncio.run(_convert_all_async(files, batch_converter, jobs=2)) == 2
+        assert batch_converter.prepare_output.call_count == 3
+        assert batch_converter.encode_async.await_count == 3
+        batch_converter.encode_group_async.assert_not_awaited()
+
+    def test_convert_all_prepare_error(self, batch_converter: MagicMock) -> None:
+        """前処理で失敗したファイルは変換しない"""
+        files = [Path("a.mp4"), Path("missing.mp4")]
+        batch_converter.prepare_output.side_effect = [
+            Path("a.mp3"),
+            FileNotFoundError("入力ファイルが見つかりません"),
+        ]
+
+        assert asyncio.run(_convert_all_async(files, batch_converter, jobs=4)) == 1
+        batch_converter.encode_async.assert_awaited_once_with(files[0], Path("a.mp3"))
+        batch_converter.encode_group_async.assert_not_awaited()
+
+    @pytest.mark.fs
+    @patch("src.main.GROUP_FILE_SIZE_LIMIT", -1)
+    def test_convert_all_largest_first(self, batch_converter: MagicMock, tmp_path: Path) -> None:
+        """サイズの大きいファイルから変換を開始する"""
+        files = [tmp_path / "small.mp4", tmp_path / "large.mp4", tmp_path / "medium.mp4"]
+        for f, size in zip(files, (10, 1000, 100)):
+            f.write_bytes(b"x" * size)
+
+        asyncio.run(_convert_all_async(files, batch_converter, jobs=1))
+
+        started = [c.args[0].name for c in batch_converter.encode_async.await_args_list]
+        assert started == ["large.mp4", "medium.mp4", "small.mp4"]
+        batch_converter.encode_group_async.assert_not_awaited()
+
+    @patch("src.main.BatchContext.from_directory")
+    def test_convert_all_shares_batch_context(
+        self, mock_from_directory: MagicMock, batch_converter: MagicMock
+    ) -> None:
+        """空き容量はバッチ開始時に一度だけ取得し、全ファイルで共有する"""
+        files = [Path("a.mp4"), Path("b.mp4")]
+
+        asyncio.run(_convert_all_async(files, batch_converter, jobs=1))
+
+        mock_from_directory.assert_called_once_with(Path("mp3"))
+        ctx = mock_from_directory.return_value
+        assert [c.args[1] for c in batch_converter.prepare_output.call_args_list] == [ctx, ctx]
+        batch_converter.encode_group_async.assert_awaited_once_with(
+            [(files[0], Path("a.mp3")), (files[1], Path("b.mp3"))]
+        )
+
+    @pytest.mark.fs
+    @patch("src.main.GROUP_FILE_SIZE_LIMIT", -1)
+    def test_convert_all_output_collision(self, batch_converter: MagicMock, tmp_path: Path) -> None:
+        """出力先が重複するファイルは同時に変換せず、エラーとして報告する"""
+        files = [tmp_path / "a.mp4", tmp_path / "a.mkv", tmp_path / "b.mp4"]
+        for f, size in zip(files, (300, 200, 100)):
+            f.write_bytes(b"x" * size)
+
+        with patch("src.main.print_error") as mock_print_error:
+            assert asyncio.run(_convert_all_async(files, batch_converter, jobs=2)) == 2
+
+        encoded = [c.args for c in batch_converter.encode_async.await_args_list]
+        assert sorted(encoded) == [
+            (files[0], tmp_path / "a.mp3"),
+            (files[2], tmp_path / "b.mp3"),
+        ]
+        batch_converter.encode_group_async.assert_not_awaited()
+        mock_print_error.assert_called_once()
+        assert "a.mp4と重複" in mock_print_error.call_args.args[0]
+
+    @pytest.mark.fs
+    @patch("src.main.GROUP_FILE_SIZE_LIMIT", 100)
+    def test_convert_all_groups_small_files(
+        self, batch_converter: MagicMock, tmp_path: Path
+    ) -> None:
+        """小さいファイルはまとめて変換し、大きいファイルは個別に変換する"""
+        files = [tmp_path / "large.mp4", tmp_path / "a.mp4", tmp_path / "b.mp4"]
+        for f, size in zip(files, (1000, 10, 20)):
+            f.write_bytes(b"x" * size)
+
+        assert asyncio.run(_convert_all_async(files, batch_converter, jobs=1)) == 3
+        batch_converter.encode_async.assert_awaited_once_with(files[0], tmp_path / "large.mp3")
+        batch_converter.encode_group_async.assert_awaited_once_with(
+            [(files[2], tmp_path / "b.mp3"), (files[1], tmp_path / "a.mp3")]
+        )
+
+    @patch("src.main.os.cpu_count")
+    def test_default_jobs(self, mock_cpu_count: MagicMock) -> None:
+        """既定の並列ジョブ数はCPUコア数の半分（最低1）"""
+        for cpu_count, expected in ((8, 4), (1, 1), (None, 1)):
+            mock_cpu_count.return_value = cpu_count
+            assert default_jobs() == expected
+
+    def test_convert_all_group_fallback(self, batch_converter: MagicMock) -> None:
+        """一括変換に失敗した場合はすべてのファイルを個別に変換し直す"""
+        files = [Path("a.mp4"), Path("b.mp4")]
+        batch_converter.encode_group_async.side_effect = ConversionError("一括変換失敗")
+        batch_converter.encode_async.side_effect = [None, ConversionError("変換失敗")]
+
+        assert asyncio.run(_convert_all_async(files, batch_converter, jobs=1)) == 1
+        batch_converter.encode_group_async.assert_awaited_once()
+        assert batch_converter.encode_async.await_count == 2
+
+    @pytest.mark.fs
+    @patch("src.main.GROUP_FILE_SIZE_LIMIT", 1000)
+    def test_convert_all_group_output_collision(
+        self, batch_converter: MagicMock, tmp_path: Path
+    ) -> None:
+        """出力先が重複するファイルは同じFFmpegコマンドにまとめない"""
+        files = [tmp_path / "a.mp4", tmp_path / "a.mkv", tmp_path / "b.mp4"]
+        for f, size in zip(files, (30, 20, 10)):
+            f.write_bytes(b"x" * size)
+
+        with patch("src.main.print_error") as mock_print_error:
+            assert asyncio.run(_convert_all_async(files, batch_converter, jobs=1)) == 2
+
+        batch_converter.encode_group_async.assert_awaited_once_with(
+            [(files[0], tmp_path / "a.mp3"), (files[2], tmp_path / "b.mp3")]
+        )
+        batch_converter.encode_async.assert_not_awaited()
+        mock_print_error.assert_called_once()
+
+
+@pytest.mark.fs
+class TestInteractiveMode:
+    """対話的モードのテスト"""
+
+    @pytest.mark.usefixtures("mock_converter")
+    def test_interactive_exit(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """0を入力すると終了する"""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "movie").mkdir()
+        (tmp_path / "movie" / "a.mp4").touch()
+
+        result = runner.invoke(cli, [], input="0\n")
+
+        assert result.exit_code == 0
+        assert "終了します" in result.stdout
+
+    @pytest.mark.usefixtures("mock_converter")
+    @patch("src.main._convert_all_async", new_callable=AsyncMock)
+    def test_interactive_convert_all(
+        self,
+        mock_convert_all: AsyncMock,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """allを入力すると全ファイルを変換する"""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "movie").mkdir()
+        (tmp_path / "movie" / "a.mp4").touch()
+        (tmp_path / "movie" / "b.mp4").touch()
+        mock_convert_all.return_value = 2
+
+        result = runner.invoke(cli, ["-j", "3"], input="all\n0\n")
+
+        assert result.exit_code == 0
+        files, _, jobs = mock_convert_all.await_args.args
+        assert [f.name for f in files] == ["a.mp4", "b.mp4"]
+        assert jobs == 3
+        assert "全2ファイル中2ファイルの変換が完了しました" in result.stdout
+
+
 class TestErrorHandling:
     """エラーハンドリングのテスト"""
 
@@ -187,9 +396,10 @@ class TestErrorHandling:
         from src.exceptions import FFmpegNotFoundError
 
         mock_converter_class.side_effect = FFmpegNotFoundError("FFmpeg not found")
-        result = runner.invoke(app, [])
+        result = runner.invoke(cli, [])
         assert result.exit_code == 1
 
+    @pytest.mark.fs
     @patch("src.main.VideoToAudioConverter")
     @patch("src.main.convert_single_file")
     def test_conversion_error_handling(
@@ -200,5 +410,5 @@ class TestErrorHandling:
         test_file.touch()
         mock_convert.return_value = False  # 変換失敗
 
-        result = runner.invoke(app, ["-f", str(test_file)])
+        result = runner.invoke(cli, ["-f", str(test_file)])
         assert result.exit_code == 1
@@ -2,6 +2,8 @@
 
 import subprocess
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -9,38 +11,110 @@ import pytest
 from src.exceptions import FFmpegNotFoundError, InsufficientSpaceError
 from src.utils import (
     SUPPORTED_VIDEO_FORMATS,
+    BatchContext,
+    _ext_supported,
     check_disk_space,
     check_ffmpeg_installed,
     create_output_directory,
+    find_ffmpeg,
     format_file_size,
+    get_cache_directory,
     get_output_path,
     get_video_files,
     is_supported_video_format,
+    scan_video_files,
     validate_ffmpeg,
 )
 
+# ファイルサイズの単位（バイト）
+KB = 1024
+MB = 1024 * KB
+GB = 1024 * MB
+
+
+@pytest.fixture(autouse=True)
+def clear_ffmpeg_cache() -> Any:
+    """FFmpeg検出結果のキャッシュをテストごとにクリア"""
+    find_ffmpeg.cache_clear()
+    check_ffmpeg_installed.cache_clear()
+    yield
+    find_ffmpeg.cache_clear()
+    check_ffmpeg_installed.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def video_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """動画と動画以外のファイルを含むディレクトリ（モジュール内で共有するため、テストで変更しないこと）"""
+    directory = tmp_path_factory.mktemp("videos")
+    for name in (
+        "video1.mp4",
+        "video2.avi",
+        "document.txt",
+        "image.jpg",
+        "c.mp4",
+        "a.mp4",
+        "b.mp4",
+    ):
+        (directory / name).touch()
+    return directory
+
+
+@pytest.fixture
+def mock_disk_usage(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """shutil.disk_usageを差し替えたモック"""
+    mock = MagicMock()
+    monkeypatch.setattr("shutil.disk_usage", mock)
+    return mock
+
+
+@pytest.fixture
+def mock_run(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """subprocess.runを差し替えたモック"""
+    mock = MagicMock()
+    monkeypatch.setattr("subprocess.run", mock)
+    return mock
+
 
 class TestFFmpegValidation:
     """FFmpeg検証のテスト"""
 
-    @patch("subprocess.run")
-    def test_check_ffmpeg_installed_success(self, mock_run: MagicMock) -> None:
-        """FFmpegがインストールされている場合"""
-        mock_run.return_value = MagicMock(returncode=0)
+    @patch("shutil.which")
+    def test_check_ffmpeg_installed_in_path(self, mock_which: MagicMock) -> None:
+        """PATH上にFFmpegがある場合"""
+        mock_which.return_value = "/usr/bin/ffmpeg"
         assert check_ffmpeg_installed() is True
-        mock_run.assert_called_once_with(["ffmpeg", "-version"], capture_output=True, check=True)
+        mock_which.assert_called_once_with("ffmpeg")
 
-    @patch("subprocess.run")
-    def test_check_ffmpeg_installed_not_found(self, mock_run: MagicMock) -> None:
-        """FFmpegがインストールされていない場合"""
-        mock_run.side_effect = FileNotFoundError()
+    @patch("shutil.which")
+    def test_check_ffmpeg_installed_not_in_path(self, mock_which: MagicMock) -> None:
+        """PATH上にFFmpegがない場合"""
+        mock_which.return_value = None
         assert check_ffmpeg_installed() is False
 
-    @patch("subprocess.run")
-    def test_check_ffmpeg_installed_error(self, mock_run: MagicMock) -> None:
-        """FFmpegコマンド実行エラー"""
-        mock_run.side_effect = subprocess.CalledProcessError(1, "ffmpeg")
-        assert check_ffmpeg_installed() is False
+    @patch("shutil.which")
+    def test_check_ffmpeg_installed_cached(self, mock_which: MagicMock) -> None:
+        """検出結果はキャッシュされる"""
+        mock_which.return_value = "/usr/bin/ffmpeg"
+        check_ffmpeg_installed()
+        check_ffmpeg_installed()
+        mock_which.assert_called_once()
+
+    @pytest.mark.parametrize(
+        ("side_effect", "expected"),
+        [
+            (None, True),
+            (FileNotFoundError(), False),
+            (subprocess.CalledProcessError(1, "ffmpeg"), False),
+        ],
+        ids=["success", "not_found", "error"],
+    )
+    def test_check_ffmpeg_installed_runtime(
+        self, mock_run: MagicMock, side_effect: Any, expected: bool
+    ) -> None:
+        """実行確認の結果（成功・未インストール・実行エラー）"""
+        mock_run.side_effect = side_effect
+        assert check_ffmpeg_installed(verify_runtime=True) is expected
+        mock_run.assert_called_once_with(["ffmpeg", "-version"], capture_output=True, check=True)
 
     @patch("src.utils.check_ffmpeg_installed")
     def test_validate_ffmpeg_success(self, mock_check: MagicMock) -> None:
@@ -52,52 +126,72 @@ class TestFFmpegValidation:
     def test_validate_ffmpeg_failure(self, mock_check: MagicMock) -> None:
         """FFmpeg検証失敗"""
         mock_check.return_value = False
-        with pytest.raises(FFmpegNotFoundError) as exc_info:
+        with pytest.raises(FFmpegNotFoundError, match="FFmpegがインストールされていません"):
             validate_ffmpeg()
-        assert "FFmpegがインストールされていません" in str(exc_info.value)
 
 
 class TestFileFormatValidation:
     """ファイル形式検証のテスト"""
 
-    def test_is_supported_video_format_valid(self) -> None:
+    @pytest.mark.parametrize(
+        "path",
+        [Path(f"test{ext}") for ext in sorted(SUPPORTED_VIDEO_FORMATS)],
+        ids=sorted(SUPPORTED_VIDEO_FORMATS),
+    )
+    def test_is_supported_video_format_valid(self, path: Path) -> None:
         """サポートされている形式"""
-        for ext in SUPPORTED_VIDEO_FORMATS:
-            file_path = Path(f"test{ext}")
-            assert is_supported_video_format(file_path) is True
+        assert is_supported_video_format(path) is True
 
-    def test_is_supported_video_format_uppercase(self) -> None:
+    @pytest.mark.parametrize("path", [Path("test.MP4"), Path("test.AVI")], ids=str)
+    def test_is_supported_video_format_uppercase(self, path: Path) -> None:
         """大文字拡張子もサポート"""
-        assert is_supported_video_format(Path("test.MP4")) is True
-        assert is_supported_video_format(Path("test.AVI")) is True
+        assert is_supported_video_format(path) is True
 
-    def test_is_supported_video_format_invalid(self) -> None:
+    @pytest.mark.parametrize(
+        "path", [Path("test.txt"), Path("test.pdf"), Path("test.mp3"), Path(".mp4")], ids=str
+    )
+    def test_is_supported_video_format_invalid(self, path: Path) -> None:
         """サポートされていない形式"""
-        assert is_supported_video_format(Path("test.txt")) is False
-        assert is_supported_video_format(Path("test.pdf")) is False
-        assert is_supported_video_format(Path("test.mp3")) is False
+        assert is_supported_video_format(path) is False
+
+    def test_ext_supported_by_name(self) -> None:
+        """ファイル名の末尾の拡張子だけで判定する"""
+        for name in ("video.mp4", "VIDEO.MKV", "archive.tar.ts", "clip.m2ts", "clip.MTS"):
+            assert _ext_supported(name) is True
+        for name in ("document.txt", "video.mp4.txt", "noext", "a.", "clip.2ts", ".mp4", ".MKV"):
+            assert _ext_supported(name) is False
 
 
 class TestFileOperations:
     """ファイル操作のテスト"""
 
-    def test_get_output_path(self, tmp_path: Path) -> None:
+    def test_get_output_path(self) -> None:
         """出力パス生成"""
         input_path = Path("movie/video.mp4")
-        output_dir = tmp_path / "output"
+        output_dir = Path("output")
         result = get_output_path(input_path, output_dir)
 
         assert result == output_dir / "video.mp3"
         assert result.suffix == ".mp3"
 
-    def test_get_output_path_japanese(self, tmp_path: Path) -> None:
+    def test_get_output_path_japanese(self) -> None:
         """日本語ファイル名の出力パス生成"""
         input_path = Path("movie/動画ファイル.mp4")
-        output_dir = tmp_path / "output"
+        output_dir = Path("output")
         result = get_output_path(input_path, output_dir)
 
         assert result == output_dir / "動画ファイル.mp3"
 
+    def test_get_cache_directory_xdg(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Linuxなどでは$XDG_CACHE_HOMEの下を使用する"""
+        monkeypatch.setattr("src.utils.sys.platform", "linux")
+        monkeypatch.setenv("XDG_CACHE_HOME", "/tmp/cache")
+        assert get_cache_directory() == Path("/tmp/cache/mp4tomp3")
+
+        monkeypatch.delenv("XDG_CACHE_HOME")
+        assert get_cache_directory() == Path.home() / ".cache" / "mp4tomp3"
+
+    @pytest.mark.fs
     def test_create_output_directory(self, tmp_path: Path) -> None:
         """出力ディレクトリ作成"""
         output_dir = tmp_path / "test_output" / "nested" / "dir"
@@ -107,6 +201,7 @@ class TestFileOperations:
         assert output_dir.exists()
         assert output_dir.is_dir()
 
+    @pytest.mark.fs
     def test_create_output_directory_already_exists(self, tmp_path: Path) -> None:
         """既存ディレクトリの場合"""
         output_dir = tmp_path / "existing"
@@ -116,6 +211,7 @@ class TestFileOperations:
         assert output_dir.exists()
 
 
+@pytest.mark.fs
 class TestGetVideoFiles:
     """動画ファイル検索のテスト"""
 
@@ -124,95 +220,116 @@ class TestGetVideoFiles:
         result = get_video_files(tmp_path)
         assert result == []
 
-    def test_get_video_files_with_videos(self, tmp_path: Path) -> None:
-        """動画ファイルが存在する場合"""
-        # テスト用ファイルを作成
-        (tmp_path / "video1.mp4").touch()
-        (tmp_path / "video2.avi").touch()
-        (tmp_path / "document.txt").touch()  # 除外される
-        (tmp_path / "image.jpg").touch()  # 除外される
-
-        result = get_video_files(tmp_path)
-        assert len(result) == 2
+    def test_get_video_files_with_videos(self, video_dir: Path) -> None:
+        """動画ファイルが存在する場合（document.txtとimage.jpgは除外される）"""
+        result = get_video_files(video_dir)
+        assert len(result) == 5
         assert all(f.suffix in SUPPORTED_VIDEO_FORMATS for f in result)
 
-    def test_get_video_files_sorted(self, tmp_path: Path) -> None:
+    def test_get_video_files_sorted(self, video_dir: Path) -> None:
         """ファイル名でソートされる"""
-        (tmp_path / "c.mp4").touch()
-        (tmp_path / "a.mp4").touch()
-        (tmp_path / "b.mp4").touch()
+        result = get_video_files(video_dir)
+        assert [f.name for f in result] == ["a.mp4", "b.mp4", "c.mp4", "video1.mp4", "video2.avi"]
+
+    def test_get_video_files_excludes_directories(self, tmp_path: Path) -> None:
+        """動画の拡張子を持つディレクトリは除外し、大文字の拡張子は含める"""
+        (tmp_path / "folder.mp4").mkdir()
+        (tmp_path / "VIDEO.MP4").touch()
+        (tmp_path / "noext").touch()
 
         result = get_video_files(tmp_path)
-        assert [f.name for f in result] == ["a.mp4", "b.mp4", "c.mp4"]
+        assert [f.name for f in result] == ["VIDEO.MP4"]
+
+    def test_scan_video_files_sizes(self, tmp_path: Path) -> None:
+        """走査時に取得したファイルサイズを返す"""
+        (tmp_path / "b.mp4").write_bytes(b"x" * 20)
+        (tmp_path / "a.mkv").write_bytes(b"x" * 10)
+
+        result = scan_video_files(tmp_path)
+        assert [(f.name, size) for f, size in result] == [("a.mkv", 10), ("b.mp4", 20)]
 
     def test_get_video_files_nonexistent_directory(self) -> None:
         """存在しないディレクトリ"""
         result = get_video_files(Path("nonexistent"))
         assert result == []
 
+    def test_get_video_files_not_directory(self, tmp_path: Path) -> None:
+        """ディレクトリではなくファイルを指定した場合"""
+        video = tmp_path / "video.mp4"
+        video.touch()
+        assert get_video_files(video) == []
+
 
 class TestDiskSpace:
     """ディスク容量チェックのテスト"""
 
-    @patch("shutil.disk_usage")
-    def test_check_disk_space_sufficient(self, mock_disk_usage: MagicMock, tmp_path: Path) -> None:
+    def test_check_disk_space_sufficient(self, mock_disk_usage: MagicMock) -> None:
         """十分な空き容量がある場合"""
-        mock_disk_usage.return_value = MagicMock(
-            free=1024 * 1024 * 1024  # 1GB
-        )
+        mock_disk_usage.return_value = SimpleNamespace(free=GB)
 
-        check_disk_space(tmp_path / "output.mp3", 100)  # 100MB必要
-        # 例外が発生しないことを確認
+        remaining = check_disk_space(Path("mp3/output.mp3"), 100)  # 100MB必要
+        assert remaining == (1024 - 100) * 1024 * 1024
 
-    @patch("shutil.disk_usage")
-    def test_check_disk_space_insufficient(
-        self, mock_disk_usage: MagicMock, tmp_path: Path
-    ) -> None:
+    def test_check_disk_space_insufficient(self, mock_disk_usage: MagicMock) -> None:
         """空き容量が不足している場合"""
-        mock_disk_usage.return_value = MagicMock(
-            free=50 * 1024 * 1024  # 50MB
-        )
+        mock_disk_usage.return_value = SimpleNamespace(free=50 * MB)
 
-        with pytest.raises(InsufficientSpaceError) as exc_info:
-            check_disk_space(tmp_path / "output.mp3", 100)  # 100MB必要
+        with pytest.raises(InsufficientSpaceError, match="空き容量が不足しています。必要: 100MB"):
+            check_disk_space(Path("mp3/output.mp3"), 100)  # 100MB必要
 
-        assert "空き容量が不足しています" in str(exc_info.value)
-        assert "必要: 100MB" in str(exc_info.value)
-
-    @patch("shutil.disk_usage")
-    def test_check_disk_space_os_error(self, mock_disk_usage: MagicMock, tmp_path: Path) -> None:
+    def test_check_disk_space_os_error(self, mock_disk_usage: MagicMock) -> None:
         """ディスク容量チェックでOSエラー"""
         mock_disk_usage.side_effect = OSError("Disk error")
 
-        with pytest.raises(InsufficientSpaceError) as exc_info:
-            check_disk_space(tmp_path / "output.mp3", 100)
+        with pytest.raises(InsufficientSpaceError, match="容量チェック中にエラーが発生しました"):
+            check_disk_space(Path("mp3/output.mp3"), 100)
+
+
+class TestBatchContext:
+    """一括変換用の空き容量コンテキストのテスト"""
+
+    def test_from_directory(self, mock_disk_usage: MagicMock) -> None:
+        """ディレクトリの空き容量から作成"""
+        mock_disk_usage.return_value = SimpleNamespace(free=GB)
+
+        ctx = BatchContext.from_directory(Path("mp3"))
+
+        assert ctx.free_bytes == 1024 * 1024 * 1024
+        mock_disk_usage.assert_called_once_with(Path("mp3"))
+
+    def test_check_disk_space_with_context(self, mock_disk_usage: MagicMock) -> None:
+        """コンテキスト指定時はディスクに問い合わせず、必要量を差し引く"""
+        ctx = BatchContext(free_bytes=250 * 1024 * 1024)
+
+        check_disk_space(Path("mp3/a.mp3"), 100, ctx)
+        check_disk_space(Path("mp3/b.mp3"), 100, ctx)
+
+        assert ctx.free_bytes == 50 * 1024 * 1024
+        mock_disk_usage.assert_not_called()
 
-        assert "容量チェック中にエラーが発生しました" in str(exc_info.value)
+        with pytest.raises(InsufficientSpaceError, match="必要: 100MB"):
+            check_disk_space(Path("mp3/c.mp3"), 100, ctx)
 
 
 class TestFormatFileSize:
     """ファイルサイズフォーマットのテスト"""
 
-    def test_format_bytes(self) -> None:
-        """バイト単位"""
-        assert format_file_size(512) == "512 B"
-        assert format_file_size(1023) == "1023 B"
-
-    def test_format_kilobytes(self) -> None:
-        """キロバイト単位"""
-        assert format_file_size(1024) == "1.0 KB"
-        assert format_file_size(1536) == "1.5 KB"
-
-    def test_format_megabytes(self) -> None:
-        """メガバイト単位"""
-        assert format_file_size(1024 * 1024) == "1.0 MB"
-        assert format_file_size(int(1.5 * 1024 * 1024)) == "1.5 MB"
-
-    def test_format_gigabytes(self) -> None:
-        """ギガバイト単位"""
-        assert format_file_size(1024 * 1024 * 1024) == "1.0 GB"
-        assert format_file_size(int(2.5 * 1024 * 1024 * 1024)) == "2.5 GB"
-
-    def test_format_zero(self) -> None:
-        """ゼロバイト"""
-        assert format_file_size(0) == "0 B"
+    @pytest.mark.parametrize(
+        ("size", "expected"),
+        [
+            (0, "0 B"),
+            (512, "512 B"),
+            (1023, "1023 B"),
+            (KB, "1.0 KB"),
+            (int(1.5 * KB), "1.5 KB"),
+            (MB, "1.0 MB"),
+            (int(1.5 * MB), "1.5 MB"),
+            (GB, "1.0 GB"),
+            (int(2.5 * GB), "2.5 GB"),
+            # GBを超えるサイズもGB単位で表示
+            (2048 * GB, "2048.0 GB"),
+        ],
+    )
+    def test_format_file_size(self, size: int, expected: str) -> None:
+        """単位ごとのフォーマット"""
+        assert format_file_size(size) == expected